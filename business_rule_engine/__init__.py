@@ -2,27 +2,54 @@
 
 __version__ = "1.0.0"
 
+from business_rule_engine.bulk import BulkFunction
+from business_rule_engine.decision_tree import DecisionTree
 from business_rule_engine.exceptions import (
+    BulkFunctionError,
     ConditionReturnValueError,
     DuplicateRuleNameError,
     DuplicateThenError,
     MissingArgumentError,
     RuleParserError,
     RuleParserSyntaxError,
+    ShardError,
 )
+from business_rule_engine.footprint import MemoryFootprint
+from business_rule_engine.matching import MatchMatrix
+from business_rule_engine.optimizer import OptimizationReport, RuleOptimization
 from business_rule_engine.parser import RuleParser
-from business_rule_engine.results import ExecutionResult, RuleResult
+from business_rule_engine.results import ExecutionResult, RuleResult, RuleTrace, TermTrace
 from business_rule_engine.rule import Rule
+from business_rule_engine.sharding import ShardedRuleSet
+from business_rule_engine.snapshot import FrozenRuleSet, RuleSetHolder
+from business_rule_engine.workload import ReplayReport, WorkloadRecorder, read_workload, replay
 
 __all__ = [
+    "BulkFunction",
+    "BulkFunctionError",
     "ConditionReturnValueError",
+    "DecisionTree",
     "DuplicateRuleNameError",
     "DuplicateThenError",
     "ExecutionResult",
+    "FrozenRuleSet",
+    "MatchMatrix",
+    "MemoryFootprint",
     "MissingArgumentError",
+    "OptimizationReport",
+    "ReplayReport",
     "Rule",
+    "RuleOptimization",
     "RuleParser",
     "RuleParserError",
     "RuleParserSyntaxError",
     "RuleResult",
+    "RuleSetHolder",
+    "RuleTrace",
+    "ShardError",
+    "ShardedRuleSet",
+    "TermTrace",
+    "WorkloadRecorder",
+    "read_workload",
+    "replay",
 ]
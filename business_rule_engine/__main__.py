@@ -0,0 +1,7 @@
+"""Entry point for ``python -m business_rule_engine``."""
+
+import sys
+
+from business_rule_engine.cli import main
+
+sys.exit(main())
@@ -0,0 +1,173 @@
+"""Priority-band hit policy: the highest band of equal-priority rules with a match fires."""
+
+from __future__ import annotations
+
+import ast
+import itertools
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple
+
+from simpleeval import EvalWithCompoundTypes
+
+from business_rule_engine.execution import build_names, execute_rules
+from business_rule_engine.results import ExecutionResult, RuleResult, RuleTrace
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+
+    from business_rule_engine.rule import Rule
+
+_TRIVIAL = (ast.Name, ast.Constant, ast.Expr)
+
+
+class BandPlan(NamedTuple):
+    """Rules grouped into priority bands, with the terms shared by their conditions."""
+
+    bands: tuple[tuple[Rule, ...], ...]
+    terms: dict[ast.AST, str]
+
+
+def band_plan(rules: Sequence[Rule]) -> BandPlan:
+    """Group *rules* into bands of equal priority.
+
+    :param rules: Enabled rules in evaluation (descending priority) order.
+    """
+    bands = tuple(tuple(band) for _, band in itertools.groupby(rules, key=lambda rule: rule.priority))
+    return BandPlan(bands, shared_terms(rules))
+
+
+def shared_terms(rules: Iterable[Rule]) -> dict[ast.AST, str]:
+    """Return the call-free sub-expressions that occur more than once in the conditions of *rules*.
+
+    Sub-expressions are compared by structure, so equal terms are found whether or not the
+    :class:`~business_rule_engine.expressions.ExpressionCache` shares their nodes.
+
+    :param rules: Rules whose conditions are searched; invalid conditions are skipped.
+    :returns: Every occurrence of a shared term, mapped to a key common to all its occurrences.
+    """
+    keys: dict[ast.AST, str] = {}
+    counts: Counter[str] = Counter()
+    for rule in rules:
+        if not rule.conditions:
+            continue
+        try:
+            condition = rule.parsed_condition()
+        except SyntaxError:
+            continue
+        for node in ast.walk(condition):
+            key = keys.get(node)
+            if key is None:
+                if isinstance(node, _TRIVIAL) or any(isinstance(n, ast.Call) for n in ast.walk(node)):
+                    continue
+                key = keys[node] = ast.dump(node)
+            counts[key] += 1
+    return {node: key for node, key in keys.items() if counts[key] > 1}
+
+
+class TermMemo:
+    """Values of shared terms for one set of names, reused by all conditions evaluated with it.
+
+    The values are discarded whenever a function is called, since the call may change
+    the objects the terms refer to; the caller clears them after running actions.
+    """
+
+    __slots__ = ("_terms", "_values")
+
+    def __init__(self, terms: dict[ast.AST, str]) -> None:
+        """Initialize an empty memo.
+
+        :param terms: Nodes whose values are memoized and their keys, see :func:`shared_terms`.
+        """
+        self._terms = terms
+        self._values: dict[str, object] = {}
+
+    def clear(self) -> None:
+        """Discard all memoized values."""
+        self._values.clear()
+
+    def evaluator(self, names: dict[str, object], functions: dict[str, Callable[..., object]]) -> EvalWithCompoundTypes:
+        """Return an evaluator that reads and stores the values of the shared terms in this memo."""
+        return _MemoEvaluator(self, names=names, functions=functions)
+
+
+class _MemoEvaluator(EvalWithCompoundTypes):  # type: ignore[misc]
+    """Evaluator that memoizes shared terms outside of comprehensions."""
+
+    def __init__(self, memo: TermMemo, **kwargs: object) -> None:
+        self._memo = memo
+        self._in_comprehension = 0
+        super().__init__(**kwargs)
+
+    def _eval(self, node: ast.AST) -> object:
+        memo = self._memo
+        key = memo._terms.get(node)  # noqa: SLF001
+        if key is None or self._in_comprehension:
+            return super()._eval(node)
+        values = memo._values  # noqa: SLF001
+        if key in values:
+            return values[key]
+        value = values[key] = super()._eval(node)
+        return value
+
+    def _eval_call(self, node: ast.Call) -> object:
+        result = super()._eval_call(node)
+        self._memo.clear()
+        return result
+
+    def _eval_comprehension(self, node: ast.AST) -> object:
+        # Inside a comprehension, a term may refer to a name bound by the comprehension.
+        self._in_comprehension += 1
+        try:
+            return super()._eval_comprehension(node)
+        finally:
+            self._in_comprehension -= 1
+
+
+def execute_bands(
+    plan: BandPlan,
+    params: Mapping[str, object],
+    *,
+    set_default_arg: bool = False,
+    default_arg: object = None,
+    explain: bool = False,
+    budget: float | None = None,
+) -> ExecutionResult:
+    """Evaluate the bands of *plan* in order and stop after the first band with a triggered rule.
+
+    All rules of a band are evaluated, so every matching rule of the band fires.  The
+    shared terms of the plan are evaluated once and reused by the following conditions
+    until a function is called or a rule fires.  See
+    :meth:`RuleParser.execute <business_rule_engine.RuleParser.execute>` for the options.
+
+    :param plan: Bands and shared terms, see :func:`band_plan`.
+    :param params: Named values available to all rule expressions.
+    :returns: :class:`~business_rule_engine.ExecutionResult` with the results of the evaluated bands.
+    """
+    rules = itertools.chain.from_iterable(plan.bands)
+    names = build_names(rules, params, set_default_arg=set_default_arg, default_arg=default_arg)
+    memo = TermMemo(plan.terms) if plan.terms else None
+    deadline = time.perf_counter() + budget if budget is not None else None
+    results: list[RuleResult] = []
+    trace: list[RuleTrace] | None = [] if explain else None
+    not_evaluated: list[str] = []
+    truncated = False
+    for band in plan.bands:
+        result = execute_rules(
+            band,
+            names,
+            stop_on_first_trigger=False,
+            set_default_arg=set_default_arg,
+            default_arg=default_arg,
+            explain=explain,
+            budget=deadline - time.perf_counter() if deadline is not None else None,
+            terms=memo,
+        )
+        results += result.results
+        if trace is not None and result.trace is not None:
+            trace += result.trace
+        not_evaluated += result.not_evaluated
+        truncated = truncated or result.truncated
+        if result:
+            break
+    return ExecutionResult(results, trace=trace, truncated=truncated, not_evaluated=not_evaluated)
@@ -0,0 +1,146 @@
+"""Bulk action dispatch: coalesce calls of bulk-capable functions across a batch of records.
+
+A function registered with ``RuleParser.register_function(function, bulk=True)`` is
+called with a list of argument tuples and returns one result per tuple.  During
+:meth:`~business_rule_engine.RuleParser.execute_batch`, actions that consist of a
+single call of such a function (``order_more(50)``) are recorded instead of executed;
+the recorded calls are dispatched with one invocation per function when the batch
+ends or a size or time threshold is reached.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from typing import TYPE_CHECKING, cast
+
+from business_rule_engine.exceptions import BulkFunctionError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+
+    from business_rule_engine.results import ExecutionResult
+
+
+class BulkFunction:
+    """Callable registered for bulk dispatch.
+
+    Outside a batch, a call is passed on immediately as a batch of one.
+    """
+
+    __slots__ = ("function", "name")
+
+    def __init__(self, function: Callable[[list[tuple[object, ...]]], object], name: str) -> None:
+        """Wrap *function*.
+
+        :param function: Callable that takes a list of argument tuples and returns one result per tuple.
+        :param name: Name under which the function is registered.
+        """
+        self.function = function
+        self.name = name
+
+    def __call__(self, *args: object) -> object:
+        """Invoke the function for a single call."""
+        return self.invoke([args])[0]
+
+    def invoke(self, calls: list[tuple[object, ...]]) -> list[object]:
+        """Invoke the function once for all *calls*.
+
+        :param calls: Argument tuples, one per call.
+        :returns: One result per call, in order.
+        :raises BulkFunctionError: If the number of results does not match the number of calls.
+        """
+        results = list(cast("Iterable[object]", self.function(calls)))
+        if len(results) != len(calls):
+            raise BulkFunctionError(self.name, len(calls), len(results))
+        return results
+
+
+class PendingResult:
+    """Placeholder for the result of a recorded call until the batch is flushed."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Initialize an unresolved placeholder."""
+        self.value: object = None
+
+
+class _Batch:
+    """Calls recorded since the last flush, grouped by function."""
+
+    __slots__ = ("calls", "count", "started")
+
+    def __init__(self) -> None:
+        self.calls: dict[BulkFunction, list[tuple[tuple[object, ...], PendingResult]]] = {}
+        self.count = 0
+        self.started = 0.0
+
+    def defer(self, function: BulkFunction, args: tuple[object, ...]) -> PendingResult:
+        if not self.count:
+            self.started = time.monotonic()
+        pending = PendingResult()
+        self.calls.setdefault(function, []).append((args, pending))
+        self.count += 1
+        return pending
+
+    def flush(self) -> None:
+        calls, self.calls, self.count = self.calls, {}, 0
+        for function, recorded in calls.items():
+            results = function.invoke([args for args, _ in recorded])
+            for (_, pending), result in zip(recorded, results, strict=True):
+                pending.value = result
+
+
+_current_batch: contextvars.ContextVar[_Batch | None] = contextvars.ContextVar("business_rule_engine_batch", default=None)
+
+
+def current_batch() -> _Batch | None:
+    """Return the batch that records bulk calls in the current context, or ``None`` outside a batch."""
+    return _current_batch.get()
+
+
+def _resolve(results: Sequence[ExecutionResult]) -> None:
+    """Replace the placeholders in the action results with the values of the flushed calls."""
+    for result in results:
+        for rule_result in result.results:
+            actions = rule_result.action_result
+            for i, value in enumerate(actions):
+                if isinstance(value, PendingResult):
+                    actions[i] = value.value
+
+
+def execute_batch(
+    execute: Callable[[Mapping[str, object]], ExecutionResult],
+    records: Iterable[Mapping[str, object]],
+    *,
+    max_pending: int | None = None,
+    max_delay: float | None = None,
+) -> list[ExecutionResult]:
+    """Execute every record with *execute*, dispatching recorded bulk calls together.
+
+    :param execute: Executes a single record, e.g. a bound :meth:`RuleParser.execute`.
+    :param records: Parameter mappings, one per record.
+    :param max_pending: Flush once this many calls are recorded.
+    :param max_delay: Flush once the oldest recorded call is this many seconds old.
+    :returns: One result per record, in order, with the results of the bulk calls filled in.
+    """
+    batch = _Batch()
+    token = _current_batch.set(batch)
+    results: list[ExecutionResult] = []
+    unresolved = 0
+    try:
+        for params in records:
+            results.append(execute(params))
+            if batch.count and (
+                (max_pending is not None and batch.count >= max_pending)
+                or (max_delay is not None and time.monotonic() - batch.started >= max_delay)
+            ):
+                batch.flush()
+                _resolve(results[unresolved:])
+                unresolved = len(results)
+    finally:
+        _current_batch.reset(token)
+    batch.flush()
+    _resolve(results[unresolved:])
+    return results
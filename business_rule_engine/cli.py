@@ -0,0 +1,297 @@
+"""Command-line batch runner: score JSON Lines or CSV records against rule files.
+
+Usage::
+
+    python -m business_rule_engine rules/reorder.rule --functions myproject.rule_functions < stock.jsonl
+
+Each input record is passed as ``params`` to :meth:`~business_rule_engine.RuleParser.execute`
+and one JSON object per record is written to the output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import importlib
+import inspect
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, TextIO
+
+from business_rule_engine.exceptions import RuleParserError
+from business_rule_engine.parser import RuleParser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from contextlib import AbstractContextManager
+
+
+class _InvalidRecord(NamedTuple):
+    """Input line that could not be decoded; reported as an error record."""
+
+    error: str
+
+
+Record = tuple[int, dict[str, object] | _InvalidRecord]
+
+
+class _ChunkResult(NamedTuple):
+    text: str
+    records: int
+    triggered: int
+    errors: int
+
+
+_WORKER_STATE: dict[str, object] = {}
+
+
+def _load_functions(module_name: str) -> None:
+    """Import *module_name* and register its public functions.
+
+    Functions the module registers itself at import time via
+    :meth:`~business_rule_engine.RuleParser.register_function` are kept as well.
+    """
+    module = importlib.import_module(module_name)
+    for name, obj in vars(module).items():
+        if not name.startswith("_") and inspect.isfunction(obj) and obj.__module__ == module.__name__:
+            RuleParser.register_function(obj)
+
+
+def build_parser(rule_files: Sequence[str], function_modules: Sequence[str]) -> RuleParser:
+    """Register the public functions of *function_modules* and load *rule_files* into a new parser.
+
+    Shared by the command-line tools.
+
+    :param rule_files: Rule files loaded with :meth:`~business_rule_engine.RuleParser.parsefile`.
+    :param function_modules: Modules whose public functions are registered first.
+    :raises OSError: If a rule file cannot be read.
+    :raises ImportError: If a module cannot be imported.
+    """
+    for module_name in function_modules:
+        _load_functions(module_name)
+    parser = RuleParser()
+    for rule_file in rule_files:
+        parser.parsefile(rule_file)
+    return parser
+
+
+def _coerce(value: str) -> object:
+    """Convert a CSV cell to a JSON scalar where possible (``"10"`` -> ``10``), else keep the string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _read_jsonl(stream: TextIO) -> Iterator[dict[str, object] | _InvalidRecord]:
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield _InvalidRecord(f"{type(e).__name__}: {e}")
+
+
+def _read_csv(stream: TextIO) -> Iterator[dict[str, object] | _InvalidRecord]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        # DictReader fills missing cells with None and collects extra cells under the key None.
+        if None in row or None in row.values():
+            fields = len(reader.fieldnames or ())
+            yield _InvalidRecord(f"ValueError: CSV line {reader.line_num} does not have {fields} fields")
+            continue
+        yield {key: _coerce(value) for key, value in row.items()}
+
+
+def _chunks(records: Iterable[dict[str, object] | _InvalidRecord], size: int) -> Iterator[list[Record]]:
+    numbered = enumerate(records)
+    while chunk := list(itertools.islice(numbered, size)):
+        yield chunk
+
+
+def _score_record(parser: RuleParser, index: int, params: dict[str, object], options: dict[str, object]) -> dict[str, object]:
+    try:
+        result = parser.execute(
+            params,
+            stop_on_first_trigger=bool(options["stop_on_first_trigger"]),
+            set_default_arg=bool(options["set_default_arg"]),
+            default_arg=options["default_arg"],
+        )
+    except Exception as e:  # noqa: BLE001 - one bad record must not abort the whole stream
+        return {"record": index, "error": f"{type(e).__name__}: {e}"}
+    triggered = [r for r in result.results if r.triggered]
+    return {
+        "record": index,
+        "triggered": [r.rule_name for r in triggered],
+        "action_results": {r.rule_name: r.action_result for r in triggered},
+    }
+
+
+def _score_chunk(parser: RuleParser, chunk: list[Record], options: dict[str, object]) -> _ChunkResult:
+    """Score a chunk of records and serialize the results as one block of JSON Lines."""
+    lines: list[str] = []
+    triggered = errors = 0
+    for index, params in chunk:
+        if isinstance(params, _InvalidRecord):
+            record: dict[str, object] = {"record": index, "error": params.error}
+        else:
+            record = _score_record(parser, index, params, options)
+        if "error" in record:
+            errors += 1
+        elif record["triggered"]:
+            triggered += 1
+        lines.append(json.dumps(record, default=str))
+    return _ChunkResult("".join(f"{line}\n" for line in lines), len(lines), triggered, errors)
+
+
+def _init_worker(rule_files: Sequence[str], function_modules: Sequence[str]) -> None:
+    _WORKER_STATE["parser"] = build_parser(rule_files, function_modules)
+
+
+def _score_chunk_in_worker(chunk: list[Record], options: dict[str, object]) -> _ChunkResult:
+    parser = _WORKER_STATE["parser"]
+    if not isinstance(parser, RuleParser):  # pragma: no cover - initializer always runs first
+        msg = "worker parser not initialized"
+        raise TypeError(msg)
+    return _score_chunk(parser, chunk, options)
+
+
+def _score_parallel(
+    chunks: Iterator[list[Record]],
+    args: argparse.Namespace,
+    options: dict[str, object],
+) -> Iterator[_ChunkResult]:
+    """Score chunks in worker processes, yielding results in input order.
+
+    At most ``2 * workers`` chunks are in flight, so memory stays bounded
+    regardless of the input size.
+    """
+    max_pending = args.workers * 2
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.rule_files, args.functions),
+    ) as executor:
+        pending: deque[concurrent.futures.Future[_ChunkResult]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_score_chunk_in_worker, chunk, options))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _build_argparser() -> argparse.ArgumentParser:
+    argparser = argparse.ArgumentParser(
+        prog="python -m business_rule_engine",
+        description="Score JSON Lines or CSV records against business rule files.",
+    )
+    argparser.add_argument("rule_files", nargs="+", metavar="RULEFILE", help="rule file(s) loaded with parsefile()")
+    argparser.add_argument(
+        "-f",
+        "--functions",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="import MODULE and register its public functions (may be repeated)",
+    )
+    argparser.add_argument("-i", "--input", default="-", help="input file, '-' for stdin (default)")
+    argparser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    argparser.add_argument(
+        "--format",
+        choices=("jsonl", "csv"),
+        help="input format; defaults to csv for *.csv inputs, jsonl otherwise",
+    )
+    argparser.add_argument(
+        "--all-rules",
+        action="store_true",
+        help="evaluate all rules instead of stopping at the first triggered rule",
+    )
+    argparser.add_argument(
+        "--default-arg",
+        metavar="JSON",
+        help="JSON value substituted for missing parameters (enables set_default_arg)",
+    )
+    argparser.add_argument("-j", "--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    argparser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="records scored and written per chunk (default: 1000)",
+    )
+    argparser.add_argument("-q", "--quiet", action="store_true", help="do not print the throughput summary")
+    return argparser
+
+
+def _open_input(path: str) -> AbstractContextManager[TextIO]:
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return Path(path).open(encoding="utf-8", newline="")
+
+
+def _open_output(path: str) -> AbstractContextManager[TextIO]:
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    return Path(path).open("w", encoding="utf-8")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the batch runner.
+
+    :param argv: Command-line arguments; defaults to ``sys.argv[1:]``.
+    :returns: Process exit code.
+    """
+    argparser = _build_argparser()
+    args = argparser.parse_args(argv)
+    if args.workers < 1:
+        argparser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        argparser.error("--chunk-size must be at least 1")
+    default_arg = None
+    if args.default_arg is not None:
+        try:
+            default_arg = json.loads(args.default_arg)
+        except ValueError:
+            argparser.error(f"--default-arg is not valid JSON: {args.default_arg!r}")
+
+    try:
+        parser = build_parser(args.rule_files, args.functions)
+    except (OSError, ImportError, RuleParserError) as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 1
+
+    options: dict[str, object] = {
+        "stop_on_first_trigger": not args.all_rules,
+        "set_default_arg": args.default_arg is not None,
+        "default_arg": default_arg,
+    }
+    input_format = args.format or ("csv" if args.input.endswith(".csv") else "jsonl")
+    reader = _read_csv if input_format == "csv" else _read_jsonl
+
+    records = triggered = errors = 0
+    start_time = time.perf_counter()
+    with _open_input(args.input) as source, _open_output(args.output) as sink:
+        chunks = _chunks(reader(source), args.chunk_size)
+        if args.workers > 1:
+            scored = _score_parallel(chunks, args, options)
+        else:
+            scored = (_score_chunk(parser, chunk, options) for chunk in chunks)
+        for chunk_result in scored:
+            sink.write(chunk_result.text)
+            records += chunk_result.records
+            triggered += chunk_result.triggered
+            errors += chunk_result.errors
+    elapsed = time.perf_counter() - start_time
+
+    if not args.quiet:
+        rate = records / elapsed if elapsed > 0 else 0.0
+        sys.stderr.write(
+            f"scored {records} records in {elapsed:.3f}s ({rate:.0f} records/s), {triggered} triggered, {errors} errors\n",
+        )
+    return 0
@@ -0,0 +1,443 @@
+"""Decision tree for first-hit rule execution.
+
+:class:`DecisionTree` compiles the conditions of a rule set into a tree that
+branches on parameter values.  Simple comparisons between a parameter and a
+literal (``stock < 20``, ``10 <= age``, ``country == "AT"``, ``tier in ("a", "b")``)
+that are combined with ``and`` are used to prune rules that cannot match in a
+branch.  Each leaf holds the remaining candidate rules in priority order, which
+are then evaluated exactly like :meth:`~business_rule_engine.RuleParser.execute`
+with ``stop_on_first_trigger=True`` does.
+
+Rules or sub-expressions that cannot be compiled (function calls, ``or``,
+comparisons between two parameters, ...) are never pruned, so they are checked in
+every leaf.  Pruning is only ever done for rules whose condition is provably false
+in a branch, therefore the triggered rule is always the one a linear scan selects
+when the linear scan does not raise.  Errors can differ: a rule pruned on one
+``and`` operand is not evaluated, so an error that another operand of it would
+raise for a missing or mistyped parameter (``a >= 2`` with ``a="y"``) is not raised.
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+import operator
+from typing import TYPE_CHECKING, NamedTuple
+
+from simpleeval import InvalidExpression
+
+from business_rule_engine.execution import build_names, execute_rules
+from business_rule_engine.optimizer import LiteralSet
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from business_rule_engine.paths import Names
+    from business_rule_engine.results import ExecutionResult
+    from business_rule_engine.rule import Rule
+
+_FLIPPED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq}
+_OPERATORS = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "=="}
+_MAX_SPLIT_CANDIDATES = 16
+
+
+class _Atom(NamedTuple):
+    """A comparison ``<name> <op> <value>``; for ``op == "in"`` *value* is a frozenset."""
+
+    name: str
+    op: str
+    value: object
+
+
+class _Range(NamedTuple):
+    low: float
+    low_inclusive: bool
+    high: float
+    high_inclusive: bool
+
+
+_UNBOUNDED = _Range(low=-math.inf, low_inclusive=False, high=math.inf, high_inclusive=False)
+
+
+class _Leaf:
+    __slots__ = ("rules",)
+
+    def __init__(self, rules: tuple[Rule, ...]) -> None:
+        self.rules = rules
+
+
+class _ThresholdNode:
+    """Branch on ``value < threshold`` (or ``value <= threshold`` if *inclusive*)."""
+
+    __slots__ = ("above", "below", "inclusive", "name", "threshold")
+
+    def __init__(self, name: str, threshold: float, *, inclusive: bool, below: _Node, above: _Node) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.inclusive = inclusive
+        self.below = below
+        self.above = above
+
+
+class _CategoryNode:
+    """Branch on the exact value of a parameter; unknown values take *default*."""
+
+    __slots__ = ("children", "default", "name")
+
+    def __init__(self, name: str, children: dict[object, _Node], default: _Node) -> None:
+        self.name = name
+        self.children = children
+        self.default = default
+
+
+_Node = _Leaf | _ThresholdNode | _CategoryNode
+
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _literal_values(node: ast.expr) -> frozenset[object] | None:
+    try:
+        if isinstance(node, ast.Constant) and isinstance(node.value, LiteralSet):
+            return frozenset(node.value)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)) and all(isinstance(e, ast.Constant) for e in node.elts):
+            return frozenset(e.value for e in node.elts)  # type: ignore[attr-defined]
+    except TypeError:
+        return None
+    return None
+
+
+def _compare_atoms(node: ast.Compare) -> Iterable[_Atom]:
+    operands = [node.left, *node.comparators]
+    for left, op, right in zip(operands, node.ops, operands[1:], strict=False):
+        if isinstance(op, ast.In) and isinstance(left, ast.Name):
+            values = _literal_values(right)
+            if values is not None:
+                yield _Atom(left.id, "in", values)
+        elif type(op) in _OPERATORS:
+            if isinstance(left, ast.Name) and isinstance(right, ast.Constant):
+                yield _Atom(left.id, _OPERATORS[type(op)], right.value)
+            elif isinstance(left, ast.Constant) and isinstance(right, ast.Name):
+                yield _Atom(right.id, _OPERATORS[_FLIPPED[type(op)]], left.value)
+
+
+def _condition_atoms(rule: Rule) -> tuple[tuple[_Atom, ...], bool]:
+    """Return comparisons that must all hold for the condition of *rule* to be truthy.
+
+    The flag is ``True`` if the condition consists of nothing but these comparisons.
+    """
+    try:
+        node = rule.parsed_condition()
+    except (SyntaxError, InvalidExpression):
+        return (), False
+    if isinstance(node, ast.Expr):
+        node = node.value
+    conjuncts = node.values if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And) else [node]
+    atoms: list[_Atom] = []
+    complete = True
+    for conjunct in conjuncts:
+        if not isinstance(conjunct, ast.Compare):
+            complete = False
+            continue
+        found = list(_compare_atoms(conjunct))
+        complete = complete and len(found) == len(conjunct.ops)
+        atoms.extend(found)
+    return tuple(atoms), complete
+
+
+def _atom_range(op: str, value: float) -> _Range:
+    """Return the numbers for which ``number <op> value`` holds."""
+    if op == "<":
+        return _Range(-math.inf, low_inclusive=False, high=value, high_inclusive=False)
+    if op == "<=":
+        return _Range(-math.inf, low_inclusive=False, high=value, high_inclusive=True)
+    if op == ">":
+        return _Range(value, low_inclusive=False, high=math.inf, high_inclusive=False)
+    if op == ">=":
+        return _Range(value, low_inclusive=True, high=math.inf, high_inclusive=False)
+    return _Range(value, low_inclusive=True, high=value, high_inclusive=True)
+
+
+def _overlaps(a: _Range, b: _Range) -> bool:
+    low, low_exclusive = max((a.low, not a.low_inclusive), (b.low, not b.low_inclusive))
+    high, high_inclusive = min((a.high, a.high_inclusive), (b.high, b.high_inclusive))
+    return low < high or (low == high and not low_exclusive and high_inclusive)
+
+
+def _contains(outer: _Range, inner: _Range) -> bool:
+    low_ok = outer.low < inner.low or (outer.low == inner.low and (outer.low_inclusive or not inner.low_inclusive))
+    high_ok = inner.high < outer.high or (inner.high == outer.high and (outer.high_inclusive or not inner.high_inclusive))
+    return low_ok and high_ok
+
+
+def _satisfiable_in_range(atom: _Atom, bounds: _Range) -> bool:
+    """Return ``False`` only if *atom* is false for every number within *bounds*."""
+    if atom.op == "in":
+        values: frozenset[object] = atom.value  # type: ignore[assignment]
+        return any(not _is_number(v) or _overlaps(_atom_range("==", v), bounds) for v in values)  # type: ignore[arg-type]
+    if not _is_number(atom.value):
+        return True
+    return _overlaps(_atom_range(atom.op, atom.value), bounds)  # type: ignore[arg-type]
+
+
+_COMPARISONS = {
+    "in": lambda value, literal: value in literal,
+    "==": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _holds_for(atom: _Atom, value: object) -> bool:
+    """Return ``False`` only if *atom* is false when its parameter equals *value*."""
+    try:
+        return bool(_COMPARISONS[atom.op](value, atom.value))
+    except TypeError:
+        return True
+
+
+class _Candidate(NamedTuple):
+    rule: Rule
+    atoms: dict[str, tuple[_Atom, ...]]
+    complete: bool
+
+    def atoms_on(self, name: str) -> tuple[_Atom, ...]:
+        return self.atoms.get(name, ())
+
+
+def _make_candidate(rule: Rule) -> _Candidate:
+    atoms, complete = _condition_atoms(rule)
+    by_name: dict[str, tuple[_Atom, ...]] = {}
+    for atom in atoms:
+        by_name[atom.name] = (*by_name.get(atom.name, ()), atom)
+    return _Candidate(rule, by_name, complete)
+
+
+class _Region(NamedTuple):
+    """Parameter values known on the path to a node: numeric ranges and exact values."""
+
+    ranges: dict[str, _Range]
+    exact: dict[str, object]
+
+    def certainly_holds(self, atom: _Atom) -> bool:
+        if atom.name in self.exact:
+            try:
+                return bool(_COMPARISONS[atom.op](self.exact[atom.name], atom.value))
+            except TypeError:
+                return False
+        bounds = self.ranges.get(atom.name)
+        if bounds is None or atom.op == "in" or not _is_number(atom.value):
+            return False
+        return _contains(_atom_range(atom.op, atom.value), bounds)  # type: ignore[arg-type]
+
+    def certainly_triggers(self, candidate: _Candidate) -> bool:
+        return candidate.complete and all(
+            self.certainly_holds(atom) for atoms in candidate.atoms.values() for atom in atoms
+        )
+
+
+class _ThresholdSplit(NamedTuple):
+    name: str
+    threshold: float
+    inclusive: bool
+    below: list[_Candidate]
+    above: list[_Candidate]
+
+    @property
+    def score(self) -> tuple[int, int]:
+        """Largest child first, then the total number of candidate copies."""
+        return max(len(self.below), len(self.above)), len(self.below) + len(self.above)
+
+
+class _CategorySplit(NamedTuple):
+    name: str
+    children: dict[object, list[_Candidate]]
+    default: list[_Candidate]
+
+    @property
+    def score(self) -> tuple[int, int]:
+        """Largest child first, then the total number of candidate copies."""
+        sizes = [len(self.default), *(len(c) for c in self.children.values())]
+        return max(sizes), sum(sizes)
+
+
+def _split_ranges(bounds: _Range, threshold: float, *, inclusive: bool) -> tuple[_Range, _Range]:
+    below = _Range(bounds.low, bounds.low_inclusive, threshold, inclusive)
+    above = _Range(threshold, not inclusive, bounds.high, bounds.high_inclusive)
+    return below, above
+
+
+def _threshold_splits(candidates: list[_Candidate], bounds: _Range, name: str) -> Iterable[_ThresholdSplit]:
+    points: set[tuple[float, bool]] = set()
+    for candidate in candidates:
+        for atom in candidate.atoms_on(name):
+            if atom.op == "in" or not _is_number(atom.value):
+                continue
+            value: float = atom.value  # type: ignore[assignment]
+            # ``x < c`` and ``x >= c`` split at "below c"; ``x <= c`` and ``x > c`` at "up to c".
+            if atom.op in {"<", ">=", "=="}:
+                points.add((value, False))
+            if atom.op in {"<=", ">", "=="}:
+                points.add((value, True))
+    ordered = sorted(p for p in points if _overlaps(_atom_range("==", p[0]), bounds))
+    if len(ordered) > _MAX_SPLIT_CANDIDATES:
+        step = len(ordered) / _MAX_SPLIT_CANDIDATES
+        ordered = [ordered[int(i * step)] for i in range(_MAX_SPLIT_CANDIDATES)]
+    for threshold, inclusive in ordered:
+        below_range, above_range = _split_ranges(bounds, threshold, inclusive=inclusive)
+        below = [c for c in candidates if all(_satisfiable_in_range(a, below_range) for a in c.atoms_on(name))]
+        above = [c for c in candidates if all(_satisfiable_in_range(a, above_range) for a in c.atoms_on(name))]
+        yield _ThresholdSplit(name, threshold, inclusive, below, above)
+
+
+def _allowed_keys(candidate: _Candidate, name: str) -> frozenset[object] | None:
+    """Return the values *name* may take for ``==``/``in`` comparisons to hold, ``None`` if unrestricted."""
+    keys: frozenset[object] | None = None
+    for atom in candidate.atoms_on(name):
+        if atom.op == "in":
+            values: frozenset[object] = atom.value  # type: ignore[assignment]
+        elif atom.op == "==":
+            values = frozenset((atom.value,))
+        else:
+            continue
+        keys = values if keys is None else keys & values
+    return keys
+
+
+def _category_split(candidates: list[_Candidate], name: str) -> _CategorySplit | None:
+    allowed = [_allowed_keys(candidate, name) for candidate in candidates]
+    children: dict[object, list[_Candidate]] = {key: [] for keys in allowed for key in keys or ()}
+    if not children:
+        return None
+    default: list[_Candidate] = []
+    for candidate, keys in zip(candidates, allowed, strict=True):
+        if keys is None:
+            default.append(candidate)
+        atoms = candidate.atoms_on(name)
+        for key in children if keys is None else keys:
+            if all(_holds_for(atom, key) for atom in atoms):
+                children[key].append(candidate)
+    return _CategorySplit(name, children, default)
+
+
+class DecisionTree:
+    """First-hit rule evaluation that reaches the triggered rule by branching on parameters.
+
+    Build it with :meth:`~business_rule_engine.RuleParser.build_decision_tree`.  The tree is
+    a snapshot of the enabled rules at build time and must be rebuilt after rules change.
+    """
+
+    def __init__(self, rules: Sequence[Rule], *, max_leaf_size: int = 4, max_depth: int = 32) -> None:
+        """Compile *rules* into a decision tree.
+
+        :param rules: Enabled rules in evaluation (descending priority) order.
+        :param max_leaf_size: Stop branching once a node holds at most this many candidate rules.
+        :param max_depth: Maximum number of branches on the way from the root to a leaf.
+        """
+        self._rules = tuple(rules)
+        self._max_leaf_size = max_leaf_size
+        self._max_depth = max_depth
+        candidates = [_make_candidate(rule) for rule in self._rules]
+        self.fallback_rules = [c.rule.rulename for c in candidates if not c.atoms]
+        """Names of rules without compilable comparisons; they are evaluated in every leaf."""
+        self._root = self._build(candidates, _Region({}, {}), 0)
+
+    def _build(self, candidates: list[_Candidate], region: _Region, depth: int) -> _Node:
+        # Rules after one that certainly triggers in this region are never reached.
+        for i, candidate in enumerate(candidates):
+            if region.certainly_triggers(candidate):
+                candidates = candidates[:i + 1]
+                break
+        if len(candidates) <= self._max_leaf_size or depth >= self._max_depth:
+            return _Leaf(tuple(c.rule for c in candidates))
+        best: _ThresholdSplit | _CategorySplit | None = None
+        for name in dict.fromkeys(name for c in candidates for name in c.atoms):
+            splits: list[_ThresholdSplit | _CategorySplit] = list(
+                _threshold_splits(candidates, region.ranges.get(name, _UNBOUNDED), name),
+            )
+            category = _category_split(candidates, name) if name not in region.exact else None
+            if category is not None:
+                splits.append(category)
+            for split in splits:
+                if split.score[0] < len(candidates) and (best is None or split.score < best.score):
+                    best = split
+        if best is None:
+            return _Leaf(tuple(c.rule for c in candidates))
+        if isinstance(best, _CategorySplit):
+            return _CategoryNode(
+                best.name,
+                {
+                    key: self._build(children, _Region(region.ranges, {**region.exact, best.name: key}), depth + 1)
+                    for key, children in best.children.items()
+                },
+                self._build(best.default, region, depth + 1),
+            )
+        below_range, above_range = _split_ranges(
+            region.ranges.get(best.name, _UNBOUNDED), best.threshold, inclusive=best.inclusive,
+        )
+        return _ThresholdNode(
+            best.name,
+            best.threshold,
+            inclusive=best.inclusive,
+            below=self._build(best.below, _Region({**region.ranges, best.name: below_range}, region.exact), depth + 1),
+            above=self._build(best.above, _Region({**region.ranges, best.name: above_range}, region.exact), depth + 1),
+        )
+
+    def _candidates(self, names: Names) -> Sequence[Rule]:
+        """Walk the tree and return the candidate rules of the reached leaf.
+
+        Falls back to all rules when a branching parameter is missing or cannot be
+        compared, so that the error it causes is raised by the rules themselves.
+        """
+        node = self._root
+        while not isinstance(node, _Leaf):
+            try:
+                value = names[node.name]
+            except (KeyError, TypeError, InvalidExpression):
+                return self._rules
+            try:
+                if isinstance(node, _CategoryNode):
+                    node = node.children.get(value, node.default)
+                elif value < node.threshold or (node.inclusive and value == node.threshold):  # type: ignore[operator]
+                    node = node.below
+                elif value >= node.threshold:  # type: ignore[operator]
+                    node = node.above
+                else:
+                    # Neither below nor above (NaN, partially ordered types): no pruning is safe.
+                    return self._rules
+            except TypeError:
+                return self._rules
+        return node.rules
+
+    def execute(
+        self,
+        params: Mapping[str, object],
+        *,
+        set_default_arg: bool = False,
+        default_arg: object = None,
+    ) -> ExecutionResult:
+        """Evaluate the rules against *params* and stop at the first triggered rule.
+
+        The triggered rule is the same as with :meth:`~business_rule_engine.RuleParser.execute`
+        and ``stop_on_first_trigger=True`` whenever that does not raise; the results
+        only contain the rules that were actually evaluated, not the rules the tree
+        ruled out.  Rules ruled out are not evaluated, so errors they would raise for
+        missing or mistyped parameters may not be raised.
+
+        :param params: Named values available to all rule expressions.
+        :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
+        :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :returns: :class:`~business_rule_engine.ExecutionResult` containing per-rule results.
+        :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
+        :raises ConditionReturnValueError: If a condition does not return a boolean value.
+        """
+        names = build_names(self._rules, params, set_default_arg=set_default_arg, default_arg=default_arg)
+        return execute_rules(
+            self._candidates(names),
+            names,
+            set_default_arg=set_default_arg,
+            default_arg=default_arg,
+        )
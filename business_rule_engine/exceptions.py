@@ -16,6 +16,10 @@ class DuplicateThenError(RuleParserSyntaxError):
         """Initialize with a fixed error message."""
         super().__init__('using multiple "then" in one rule is not allowed')
 
+    def __reduce__(self) -> tuple[type, tuple[()]]:
+        """Pickle without the message, which ``__init__`` builds itself."""
+        return type(self), ()
+
 
 class DuplicateRuleNameError(RuleParserError):
     """Raised when a rule with the given name has already been registered."""
@@ -26,6 +30,11 @@ class DuplicateRuleNameError(RuleParserError):
         :param rulename: Name of the rule that already exists.
         """
         super().__init__(f"Rule '{rulename}' already exists!")
+        self.rulename = rulename
+
+    def __reduce__(self) -> tuple[type, tuple[str]]:
+        """Pickle with the constructor argument instead of the formatted message."""
+        return type(self), (self.rulename,)
 
 
 class MissingArgumentError(RuleParserError):
@@ -41,3 +50,32 @@ class ConditionReturnValueError(RuleParserError):
         :param rulename: Name of the rule whose condition returned a non-boolean.
         """
         super().__init__(f"rule: {rulename} - condition does not return a boolean value!")
+        self.rulename = rulename
+
+    def __reduce__(self) -> tuple[type, tuple[str]]:
+        """Pickle with the constructor argument instead of the formatted message."""
+        return type(self), (self.rulename,)
+
+
+class BulkFunctionError(RuleParserError):
+    """Raised when a bulk function does not return exactly one result per recorded call."""
+
+    def __init__(self, function_name: str, calls: int, results: int) -> None:
+        """Initialize the exception.
+
+        :param function_name: Name of the bulk function.
+        :param calls: Number of calls passed to the function.
+        :param results: Number of results the function returned.
+        """
+        super().__init__(f"bulk function {function_name} returned {results} results for {calls} calls")
+        self.function_name = function_name
+        self.calls = calls
+        self.results = results
+
+    def __reduce__(self) -> tuple[type, tuple[str, int, int]]:
+        """Pickle with the constructor arguments instead of the formatted message."""
+        return type(self), (self.function_name, self.calls, self.results)
+
+
+class ShardError(RuleParserError):
+    """Raised when a shard worker fails, or raises an error that cannot be passed back to the caller."""
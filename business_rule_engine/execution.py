@@ -0,0 +1,108 @@
+"""Evaluation loop shared by :class:`~business_rule_engine.RuleParser` and frozen rule sets."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from business_rule_engine.paths import Names
+from business_rule_engine.results import ExecutionResult, RuleResult, RuleTrace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from business_rule_engine.bands import TermMemo
+    from business_rule_engine.rule import Rule
+
+logger = logging.getLogger(__name__)
+
+
+def build_names(
+    rules: Iterable[Rule],
+    params: Mapping[str, object],
+    *,
+    set_default_arg: bool,
+    default_arg: object,
+) -> Names:
+    """Return the names shared by *rules* for one execution, or *params* if it already is one.
+
+    All rules of a rule set share one function table, which is used for access paths on
+    registered functions and objects.
+    """
+    if type(params) is Names:
+        return params
+    rule = next(iter(rules), None)
+    functions = rule.functions if rule is not None else None
+    return Names(params, set_default_arg=set_default_arg, default_arg=default_arg, functions=functions)
+
+
+def execute_rules(
+    rules: Sequence[Rule],
+    params: Mapping[str, object],
+    *,
+    stop_on_first_trigger: bool = True,
+    set_default_arg: bool = False,
+    default_arg: object = None,
+    explain: bool = False,
+    budget: float | None = None,
+    terms: TermMemo | None = None,
+) -> ExecutionResult:
+    """Evaluate *rules* in the given order; see :meth:`~business_rule_engine.RuleParser.execute`.
+
+    Only the return values of the rules are used, never :attr:`Rule.status`, so the
+    same rules can be evaluated by several threads at once.  The names are built once
+    and shared by all rules, so every access path is resolved at most once per call.
+
+    :param rules: Enabled rules in evaluation order.
+    :param params: Named values available to all rule expressions.
+    :param terms: Memo of shared condition terms, see :func:`~business_rule_engine.bands.execute_bands`.
+    :returns: :class:`~business_rule_engine.ExecutionResult` containing per-rule results.
+    """
+    results: list[RuleResult] = []
+    trace: list[RuleTrace] | None = [] if explain else None
+    debug = logger.isEnabledFor(logging.DEBUG)
+    deadline = time.perf_counter() + budget if budget is not None else None
+    not_evaluated: list[str] = []
+    truncated = False
+    names = build_names(rules, params, set_default_arg=set_default_arg, default_arg=default_arg)
+
+    for index, rule in enumerate(rules):
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                not_evaluated.extend(r.rulename for r in rules[index:])
+                truncated = True
+                break
+            if rule.cost > remaining:
+                not_evaluated.append(rule.rulename)
+                truncated = True
+                continue
+
+        if debug:
+            logger.debug("Rule name: %s", rule.rulename)
+            logger.debug("Conditions: %s", rule.conditions)
+            logger.debug("Actions: %s", rule.actions)
+
+        if trace is not None:
+            rule_trace = rule._explain(names, deadline=deadline)  # noqa: SLF001
+            trace.append(rule_trace)
+            condition_result, action_results = rule_trace.condition_result, rule_trace.action_result
+        else:
+            condition_result, action_results = rule._execute(names, deadline=deadline, terms=terms)  # noqa: SLF001
+        if condition_result and len(action_results) < len(rule.actions):
+            truncated = True
+
+        results.append(RuleResult(
+            rule_name=rule.rulename,
+            triggered=condition_result,
+            condition_result=condition_result,
+            action_result=action_results,
+        ))
+
+        if condition_result and stop_on_first_trigger:
+            if debug:
+                logger.debug("Stop on first trigger")
+            break
+
+    return ExecutionResult(results, trace=trace, truncated=truncated, not_evaluated=not_evaluated)
@@ -0,0 +1,139 @@
+"""Shared cache of parsed rule expressions."""
+
+from __future__ import annotations
+
+import ast
+import sys
+
+from simpleeval import SimpleEval
+
+from business_rule_engine.paths import PathName, compile_path
+
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+class ExpressionCache:
+    """Parse rule expressions once and share the parsed form between rules.
+
+    Identical expression strings are parsed only once.  Names, literals and operators
+    of different expressions (``x``, ``20``, ``<``, ...) share a single node, and so do
+    sub-expressions (``x < 20``) once they occur again in another expression.
+    Access chains on parameters (``order.customer.country``) are compiled into
+    :class:`~business_rule_engine.paths.AccessPath` names.
+    Cached nodes are shared and must not be modified.
+    """
+
+    __slots__ = ("_nodes", "_parsed", "_paths")
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._parsed: dict[str, ast.AST] = {}
+        self._nodes: dict[tuple[object, ...], ast.AST] = {}
+        self._paths: dict[str, PathName] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct cached expressions."""
+        return len(self._parsed)
+
+    def __contains__(self, expression: object) -> bool:
+        """Return ``True`` if *expression* has already been parsed."""
+        return expression in self._parsed
+
+    @property
+    def node_count(self) -> int:
+        """Number of expression nodes kept for sharing between the cached expressions."""
+        return len(self._nodes)
+
+    def get(self, expression: str) -> ast.AST:
+        """Return the parsed form of *expression*, parsing it on first use.
+
+        :param expression: Rule expression source.
+        :raises SyntaxError: If *expression* is not valid Python syntax.
+        """
+        node = self._parsed.get(expression)
+        if node is None:
+            node = self.add(expression, SimpleEval.parse(expression))
+        return node
+
+    def add(self, expression: str, node: ast.AST) -> ast.AST:
+        """Store *node* as the parsed form of *expression*, replacing a previous entry.
+
+        :param expression: Rule expression source.
+        :param node: Parsed (and possibly rewritten) expression; it is not modified.
+        :returns: The shared node stored in the cache.
+        """
+        shared, _ = self._share(node)
+        self._parsed[sys.intern(expression)] = shared
+        return shared
+
+    def clear(self) -> None:
+        """Remove all cached expressions."""
+        self._parsed.clear()
+        self._nodes.clear()
+        self._paths.clear()
+
+    def _share(
+        self,
+        node: ast.AST,
+        bound: frozenset[str] = frozenset(),
+        *,
+        compile_paths: bool = True,
+    ) -> tuple[ast.AST, bool]:
+        """Return the copy of *node* without source positions, built bottom-up, and whether it is shared.
+
+        Names, literals and operators are always looked up in and added to the node table.
+        A compound node is only shared once all of its children are shared, i.e. once all
+        names and literals below it have occurred before; a sub-expression containing a
+        literal that occurs only once (a generated threshold, say) is never added to the table.
+
+        :param bound: Names bound by enclosing comprehensions.
+        :param compile_paths: Compile access chains; off for the callee of a call.
+        """
+        path = compile_path(node, bound, self._paths) if compile_paths else None
+        if path is not None:
+            node = path
+        if isinstance(node, _COMPREHENSIONS):
+            bound |= {n.id for generator in node.generators for n in ast.walk(generator.target) if isinstance(n, ast.Name)}
+        fields: dict[str, object] = {}
+        key: list[object] = [type(node)]
+        leaf = True
+        children_shared = True
+        for name, value in ast.iter_fields(node):
+            if isinstance(value, ast.AST):
+                callee = isinstance(node, ast.Call) and name == "func"
+                child, child_shared = self._share(value, bound, compile_paths=not callee)
+                fields[name] = child
+                key.append(id(child))
+                leaf = leaf and isinstance(value, ast.expr_context)
+                children_shared = children_shared and child_shared
+            elif isinstance(value, list):
+                items: list[object] = []
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        item, item_shared = self._share(item, bound)  # noqa: PLW2901
+                        children_shared = children_shared and item_shared
+                    items.append(item)
+                fields[name] = items
+                key.append(tuple(id(v) if isinstance(v, ast.AST) else _value_key(v) for v in items))
+                leaf = False
+            else:
+                fields[name] = value
+                key.append(_value_key(value))
+        if not (leaf or children_shared):
+            return type(node)(**fields), False
+        cache_key = tuple(key)
+        existing = self._nodes.get(cache_key)
+        if existing is not None:
+            return existing, True
+        existing = self._nodes[cache_key] = type(node)(**fields)
+        return existing, not leaf
+
+
+def _value_key(value: object) -> tuple[type, object]:
+    """Return a key that only matches literals with identical type and representation.
+
+    Equality is not enough: ``0.0 == -0.0`` and ``(1, 2) == (1.0, 2)``, but they print differently.
+    """
+    if isinstance(value, (str, bytes, int)) or value is None:
+        return (type(value), value)
+    return (type(value), repr(value))
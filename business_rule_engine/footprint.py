@@ -0,0 +1,100 @@
+"""Memory footprint measurement for rule sets."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from business_rule_engine.expressions import ExpressionCache
+    from business_rule_engine.rule import Rule
+
+_SCALARS = (str, bytes, int, float, complex)
+
+
+@dataclass
+class MemoryFootprint:
+    """Approximate memory used by a rule set.
+
+    Sizes are measured with :func:`sys.getsizeof` on every reachable object; objects
+    shared between rules (interned strings, shared parsed expressions) are counted once.
+    Registered functions are not included.
+
+    :param rules: Number of rules.
+    :param rule_bytes: Rule objects, their names, descriptions and expression strings, and the rule index.
+    :param expression_bytes: Parsed expressions shared by all rules.
+    :param expressions: Number of distinct parsed expressions.
+    :param expression_nodes: Number of expression nodes kept for sharing between the parsed expressions.
+    """
+
+    rules: int
+    rule_bytes: int
+    expression_bytes: int
+    expressions: int
+    expression_nodes: int
+
+    @property
+    def total_bytes(self) -> int:
+        """Total number of bytes used by the rule set."""
+        return self.rule_bytes + self.expression_bytes
+
+    @property
+    def bytes_per_rule(self) -> float:
+        """Average number of bytes per rule, including its share of the parsed expressions."""
+        return self.total_bytes / self.rules if self.rules else 0.0
+
+
+def _deep_sizeof(root: object, seen: set[int]) -> int:
+    """Return the size of *root* and everything it references that is not yet in *seen*."""
+    size = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or callable(obj) or isinstance(obj, ModuleType):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if obj is None or isinstance(obj, _SCALARS):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                slots = cls.__dict__.get("__slots__", ())
+                names = (slots,) if isinstance(slots, str) else slots
+                stack.extend(getattr(obj, name) for name in names if hasattr(obj, name))
+    return size
+
+
+def measure_footprint(
+    rules: Mapping[str, Rule],
+    expressions: ExpressionCache,
+    *,
+    exclude: Iterable[object] = (),
+) -> MemoryFootprint:
+    """Measure the memory used by *rules* and the parsed *expressions* they share.
+
+    :param rules: Rules keyed by name, as stored in :attr:`RuleParser.rules <business_rule_engine.RuleParser.rules>`.
+    :param expressions: Cache of parsed expressions shared by the rules.
+    :param exclude: Objects (and everything only reachable through them) not to count.
+    :returns: The measured footprint.
+    """
+    seen = {id(obj) for obj in exclude}
+    expression_bytes = _deep_sizeof(expressions, seen)
+    rule_bytes = _deep_sizeof(rules, seen)
+    return MemoryFootprint(
+        rules=len(rules),
+        rule_bytes=rule_bytes,
+        expression_bytes=expression_bytes,
+        expressions=len(expressions),
+        expression_nodes=expressions.node_count,
+    )
@@ -0,0 +1,105 @@
+"""Match-only evaluation: which rules are satisfied, without running actions."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from business_rule_engine.execution import build_names
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from business_rule_engine.rule import Rule
+
+
+def match_plan(rules: Iterable[Rule]) -> list[tuple[int, Rule]]:
+    """Return the enabled rules with their bit position, in evaluation (descending priority) order.
+
+    :param rules: All rules in insertion order; the position of a rule is its bit.
+    """
+    plan = [(bit, rule) for bit, rule in enumerate(rules) if rule.enabled]
+    plan.sort(key=lambda entry: entry[1].priority, reverse=True)
+    return plan
+
+
+def match_rules(
+    plan: Sequence[tuple[int, Rule]],
+    params: Mapping[str, object],
+    *,
+    set_default_arg: bool = False,
+    default_arg: object = None,
+) -> int:
+    """Evaluate the conditions of *plan* and return the bitset of satisfied rules.
+
+    :param plan: Rules with their bit position, see :func:`match_plan`.
+    :param params: Named values available to the conditions.
+    :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
+    :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+    :returns: Integer with bit ``i`` set if rule ``i`` matched.
+    """
+    names = build_names((rule for _, rule in plan), params, set_default_arg=set_default_arg, default_arg=default_arg)
+    bits = 0
+    for bit, rule in plan:
+        if rule._check(names):  # noqa: SLF001
+            bits |= 1 << bit
+    return bits
+
+
+class MatchMatrix:
+    """Bitmap of matched rules with one row per record, as returned by ``match_batch()``.
+
+    Each row takes ``ceil(len(rule_names) / 8)`` bytes; bit ``i`` of a row (little
+    endian) stands for ``rule_names[i]``.
+    """
+
+    __slots__ = ("_data", "_row_bytes", "_rows", "rule_names", "version")
+
+    def __init__(self, rule_names: Sequence[str], version: int) -> None:
+        """Initialize an empty matrix.
+
+        :param rule_names: Rule names in bit order.
+        :param version: Version of the rule set the bits refer to.
+        """
+        self.rule_names = tuple(rule_names)
+        self.version = version
+        self._row_bytes = (len(self.rule_names) + 7) // 8
+        self._rows = 0
+        self._data = bytearray()
+
+    def append(self, bits: int) -> None:
+        """Add a row.
+
+        :param bits: Bitset of matched rules, as returned by ``match()``.
+        """
+        self._data += bits.to_bytes(self._row_bytes, "little")
+        self._rows += 1
+
+    def __len__(self) -> int:
+        """Return the number of rows (records)."""
+        return self._rows
+
+    def row(self, record: int) -> int:
+        """Return the bitset of matched rules for *record*.
+
+        :raises IndexError: If *record* is out of range.
+        """
+        if not -self._rows <= record < self._rows:
+            msg = "record index out of range"
+            raise IndexError(msg)
+        start = (record % self._rows) * self._row_bytes
+        return int.from_bytes(self._data[start:start + self._row_bytes], "little")
+
+    def __getitem__(self, key: tuple[int, int]) -> bool:
+        """Return ``True`` if rule ``key[1]`` matched record ``key[0]``."""
+        record, bit = key
+        return bool(self.row(record) >> bit & 1)
+
+    def matched(self, record: int) -> list[str]:
+        """Return the names of the rules matched by *record*, in bit order."""
+        bits = self.row(record)
+        return [name for bit, name in enumerate(self.rule_names) if bits >> bit & 1]
+
+    @property
+    def data(self) -> memoryview:
+        """Read-only view of the raw bitmap, rows concatenated."""
+        return memoryview(self._data).toreadonly()
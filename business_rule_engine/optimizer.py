@@ -0,0 +1,227 @@
+"""Load-time optimizer for rule expressions.
+
+The optimizer rewrites the parsed expressions of a rule once, when the rule is
+added to a :class:`~business_rule_engine.RuleParser` created with ``optimize=True``:
+
+* constant sub-expressions (``60 * 60``, ``1 == 1``) are folded into literals,
+* literal lists, tuples and sets on the right-hand side of ``in`` / ``not in``
+  are replaced by a hashed :class:`LiteralSet`,
+* boolean identities (``True and x``, ``False or x``, ``x if True else y``) are simplified,
+* rules whose condition folds to a false constant are reported as dead.
+
+Every rewrite preserves the result of the expression; sub-expressions that raise
+when folded are left untouched so that the error still surfaces at execution time.
+"""
+
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from simpleeval import EvalWithCompoundTypes, InvalidExpression
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from business_rule_engine.rule import Rule
+
+
+class LiteralSet:
+    """Hashed replacement for a literal collection used as the right operand of ``in``.
+
+    Membership tests are O(1) instead of a linear scan.  Unhashable operands fall
+    back to the linear scan, so the result is always identical to the original literal.
+    """
+
+    __slots__ = ("_items", "_source")
+
+    def __init__(self, items: Iterable[object], source: str) -> None:
+        """Initialize the set.
+
+        :param items: Hashable literal values.
+        :param source: Source text of the original literal, used as ``repr``.
+        """
+        self._items = frozenset(items)
+        self._source = source
+
+    def __contains__(self, item: object) -> bool:
+        """Return ``True`` if *item* equals one of the literal values."""
+        try:
+            return item in self._items
+        except TypeError:
+            return any(item == value for value in self._items)
+
+    def __iter__(self) -> Iterator[object]:
+        """Iterate over the literal values."""
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        """Return the source text of the original literal."""
+        return self._source
+
+
+@dataclass
+class RuleOptimization:
+    """Optimizations applied to a single rule.
+
+    :param rule_name: Name of the optimized rule.
+    :param folded_constants: Number of constant sub-expressions folded into literals.
+    :param literal_sets: Number of literal collections converted to a :class:`LiteralSet`.
+    :param simplified_booleans: Number of simplified ``and``/``or``/conditional expressions.
+    :param always_false: The condition is provably false, so the rule can never trigger.
+    """
+
+    rule_name: str
+    folded_constants: int = 0
+    literal_sets: int = 0
+    simplified_booleans: int = 0
+    always_false: bool = False
+
+    @property
+    def changed(self) -> bool:
+        """Return ``True`` if any expression of the rule was rewritten."""
+        return bool(self.folded_constants or self.literal_sets or self.simplified_booleans)
+
+
+@dataclass
+class OptimizationReport:
+    """Optimizations applied to all rules of a parser, keyed by rule name."""
+
+    rules: dict[str, RuleOptimization] = field(default_factory=dict)
+
+    @property
+    def dead_rules(self) -> list[str]:
+        """Names of rules whose condition is provably always false."""
+        return [name for name, optimization in self.rules.items() if optimization.always_false]
+
+    @property
+    def changed_rules(self) -> list[str]:
+        """Names of rules with at least one rewritten expression."""
+        return [name for name, optimization in self.rules.items() if optimization.changed]
+
+
+def _is_literal(node: ast.AST) -> bool:
+    return isinstance(node, ast.Constant)
+
+
+def _hashable_literals(node: ast.expr) -> list[object] | None:
+    """Return the values of a list/tuple/set literal made of hashable constants, else ``None``."""
+    if not isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return None
+    values: list[object] = []
+    for elt in node.elts:
+        if not isinstance(elt, ast.Constant):
+            return None
+        try:
+            hash(elt.value)
+        except TypeError:
+            return None
+        values.append(elt.value)
+    return values
+
+
+class _ExpressionOptimizer(ast.NodeTransformer):
+    """Bottom-up rewriter that records its changes in a :class:`RuleOptimization`."""
+
+    def __init__(self, optimization: RuleOptimization) -> None:
+        self.optimization = optimization
+
+    def _fold(self, node: ast.expr) -> ast.expr:
+        """Evaluate a constant-only *node* and return it as a literal, or *node* if evaluation fails."""
+        try:
+            value = EvalWithCompoundTypes(names={}, functions={}).eval(ast.unparse(node), node)
+        except (InvalidExpression, ArithmeticError, TypeError, ValueError):
+            return node
+        return ast.copy_location(ast.Constant(value=value), node)
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.expr:
+        self.generic_visit(node)
+        if not _is_literal(node.operand):
+            return node
+        folded = self._fold(node)
+        # A signed number literal such as ``-5`` is not worth reporting.
+        if folded is not node and not isinstance(node.op, (ast.USub, ast.UAdd)):
+            self.optimization.folded_constants += 1
+        return folded
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        self.generic_visit(node)
+        if not (_is_literal(node.left) and _is_literal(node.right)):
+            return node
+        folded = self._fold(node)
+        if folded is not node:
+            self.optimization.folded_constants += 1
+        return folded
+
+    def visit_Compare(self, node: ast.Compare) -> ast.expr:
+        self.generic_visit(node)
+        for i, (op, comparator) in enumerate(zip(node.ops, node.comparators, strict=True)):
+            values = _hashable_literals(comparator) if isinstance(op, (ast.In, ast.NotIn)) else None
+            if values is not None:
+                literal = ast.Constant(value=LiteralSet(values, ast.unparse(comparator)))  # type: ignore[arg-type]
+                node.comparators[i] = ast.copy_location(literal, comparator)
+                self.optimization.literal_sets += 1
+        if not (_is_literal(node.left) and all(_is_literal(c) for c in node.comparators)):
+            return node
+        folded = self._fold(node)
+        if folded is not node:
+            self.optimization.folded_constants += 1
+        return folded
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.expr:
+        self.generic_visit(node)
+        # ``and`` returns the first falsy operand (or the last one); ``or`` the first truthy one.
+        # A literal that cannot decide the result is dropped, a literal that does ends the chain.
+        decides = not isinstance(node.op, ast.And)
+        values: list[ast.expr] = []
+        last = len(node.values) - 1
+        for i, value in enumerate(node.values):
+            if isinstance(value, ast.Constant):
+                if bool(value.value) is decides:
+                    values.append(value)
+                    break
+                if i != last:
+                    continue
+            values.append(value)
+        if len(values) == len(node.values):
+            return node
+        self.optimization.simplified_booleans += 1
+        if len(values) == 1:
+            return values[0]
+        node.values = values
+        return node
+
+    def visit_IfExp(self, node: ast.IfExp) -> ast.expr:
+        self.generic_visit(node)
+        if not isinstance(node.test, ast.Constant):
+            return node
+        self.optimization.simplified_booleans += 1
+        return node.body if node.test.value else node.orelse
+
+
+def _is_always_false(node: ast.AST) -> bool:
+    """Return ``True`` if *node* can only evaluate to a falsy value."""
+    if isinstance(node, ast.Expr):
+        return _is_always_false(node.value)
+    if isinstance(node, ast.Constant):
+        return not node.value
+    if isinstance(node, ast.BoolOp):
+        if isinstance(node.op, ast.And):
+            return any(_is_always_false(value) for value in node.values)
+        return all(_is_always_false(value) for value in node.values)
+    return False
+
+
+def optimize_rule(rule: Rule) -> RuleOptimization:
+    """Optimize the condition and action expressions of *rule* in place.
+
+    :param rule: Rule whose parsed expressions are rewritten.
+    :returns: The optimizations applied to the rule.
+    :raises SyntaxError: If an expression is not valid Python syntax.
+    """
+    optimization = RuleOptimization(rule.rulename)
+    rule.compile(_ExpressionOptimizer(optimization).visit)
+    if rule.conditions:
+        optimization.always_false = _is_always_false(rule.parsed_condition())
+    return optimization
@@ -2,22 +2,42 @@
 
 from __future__ import annotations
 
-import logging
+import contextlib
+import gc
 import re
+import sys
+import threading
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
+from business_rule_engine.bands import BandPlan, band_plan, execute_bands
+from business_rule_engine.bulk import BulkFunction, execute_batch
+from business_rule_engine.decision_tree import DecisionTree
 from business_rule_engine.exceptions import (
     DuplicateRuleNameError,
     DuplicateThenError,
 )
-from business_rule_engine.results import ExecutionResult, RuleResult
+from business_rule_engine.execution import execute_rules
+from business_rule_engine.expressions import ExpressionCache
+from business_rule_engine.footprint import MemoryFootprint, measure_footprint
+from business_rule_engine.matching import MatchMatrix, match_plan, match_rules
+from business_rule_engine.optimizer import OptimizationReport, optimize_rule
 from business_rule_engine.rule import Rule
+from business_rule_engine.sharding import Partition, ShardedRuleSet
+from business_rule_engine.snapshot import FrozenRuleSet
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator, Mapping
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 
-logger = logging.getLogger(__name__)
+    from business_rule_engine.results import ExecutionResult
+    from business_rule_engine.workload import WorkloadRecorder
+
+
+def _prepare_all(rules: Sequence[Rule]) -> None:
+    """Run the deferred preparation of *rules*; failures stay pending and surface on evaluation."""
+    for rule in rules:
+        with contextlib.suppress(Exception):
+            rule.prepare()
 
 
 class RuleParser:
@@ -43,14 +63,32 @@ class RuleParser:
     _RULE_PATTERN = re.compile(r'^rule\s+"([^"]+)"(?:\s+priority\s+(-?\d+))?', re.IGNORECASE)
     _DESCRIPTION_PATTERN = re.compile(r'^description\s+"([^"]*)"', re.IGNORECASE)
     _PRIORITY_PATTERN = re.compile(r"^priority\s+(-?\d+)$", re.IGNORECASE)
+    _COST_PATTERN = re.compile(r"^cost\s+(\d+(?:\.\d*)?|\.\d+)$", re.IGNORECASE)
 
-    def __init__(self, *, condition_requires_bool: bool = True) -> None:
+    def __init__(self, *, condition_requires_bool: bool = True, optimize: bool = False, lazy: bool = False) -> None:
         """Initialize the rule parser.
 
         :param condition_requires_bool: Require all rule conditions to return a boolean value.
+        :param optimize: Run the load-time optimizer (constant folding, literal sets,
+            boolean simplification) on every rule added to this parser.  The applied
+            optimizations are recorded in :attr:`optimization_report`.
+        :param lazy: Only record the rules when they are loaded, and parse, validate and
+            optimize each rule right before it is evaluated for the first time.  Use
+            :meth:`validate_all` to surface errors and :meth:`warm_up` to prepare rules ahead of time.
         """
         self.rules: dict[str, Rule] = {}
         self.condition_requires_bool = condition_requires_bool
+        self.optimize = optimize
+        self.lazy = lazy
+        self.optimization_report = OptimizationReport()
+        self.expressions = ExpressionCache()
+        """Parsed expressions shared by all rules of this parser."""
+        self.version = 0
+        """Incremented whenever rules are added or removed; identifies the bit order of :meth:`match`."""
+        self.recorder: WorkloadRecorder | None = None
+        """Records the params and options of :meth:`execute` calls when set, see
+        :class:`~business_rule_engine.WorkloadRecorder`."""
+        self._band_plan: tuple[tuple[tuple[Rule, int], ...], BandPlan] | None = None
 
     def _make_rule(self, rulename: str, priority: int = 0) -> Rule:
         return Rule(
@@ -58,8 +96,21 @@ class RuleParser:
             condition_requires_bool=self.condition_requires_bool,
             priority=priority,
             functions=RuleParser.CUSTOM_FUNCTIONS,
+            expressions=self.expressions,
         )
 
+    def _prepare_rule(self, rule: Rule) -> None:
+        if self.lazy:
+            rule.defer_preparation(self._prepare_now)
+        elif self.optimize:
+            self._prepare_now(rule)
+
+    def _prepare_now(self, rule: Rule) -> None:
+        if self.optimize:
+            self.optimization_report.rules[rule.rulename] = optimize_rule(rule)
+        else:
+            rule.compile()
+
     def _parse_rule_header(self, line: str) -> tuple[str, int] | None:
         rule_match = self._RULE_PATTERN.match(line)
         if not rule_match:
@@ -73,12 +124,16 @@ class RuleParser:
     def _parse_metadata_line(self, line: str, rulename: str) -> bool:
         desc_match = self._DESCRIPTION_PATTERN.match(line)
         if desc_match:
-            self.rules[rulename].description = desc_match.group(1)
+            self.rules[rulename].description = sys.intern(desc_match.group(1))
             return True
         prio_match = self._PRIORITY_PATTERN.match(line)
         if prio_match:
             self.rules[rulename].priority = int(prio_match.group(1))
             return True
+        cost_match = self._COST_PATTERN.match(line)
+        if cost_match:
+            self.rules[rulename].cost = float(cost_match.group(1))
+            return True
         return False
 
     def _handle_keyword(self, line: str, *, is_then: bool) -> tuple[bool, bool, bool] | None:
@@ -99,8 +154,10 @@ class RuleParser:
         :param text: DSL text containing one or more rule definitions.
         :raises DuplicateRuleNameError: If a rule name appears more than once.
         :raises DuplicateThenError: If a rule block contains more than one ``then`` section.
+        :raises SyntaxError: If *optimize* is enabled (and *lazy* is not) and an expression is not valid Python syntax.
         """
         rulename: str | None = None
+        added: list[Rule] = []
         is_condition: bool = False
         is_action: bool = False
         is_then: bool = False
@@ -114,6 +171,7 @@ class RuleParser:
             if header is not None:
                 rulename, priority = header
                 self.rules[rulename] = self._make_rule(rulename, priority)
+                added.append(self.rules[rulename])
                 is_condition = is_action = is_then = False
                 continue
 
@@ -126,9 +184,17 @@ class RuleParser:
                 continue
 
             if rulename and is_condition:
-                self.rules[rulename].conditions.append(line)
+                self.rules[rulename].conditions.append(sys.intern(line))
             elif rulename and is_action:
-                self.rules[rulename].actions.append(line)
+                self.rules[rulename].actions.append(sys.intern(line))
+
+        if added:
+            self.version += 1
+        for rule in added:
+            # Copy the expression lists to drop the over-allocation left by append().
+            rule.conditions = [*rule.conditions]
+            rule.actions = [*rule.actions]
+            self._prepare_rule(rule)
 
     def parsefile(self, filepath: str | Path) -> None:
         """Parse rules from a DSL file and add them to the parser.
@@ -149,6 +215,7 @@ class RuleParser:
         priority: int = 0,
         enabled: bool = True,
         description: str = "",
+        cost: float = 0.0,
     ) -> None:
         """Register a rule programmatically without parsing DSL text.
 
@@ -158,26 +225,40 @@ class RuleParser:
         :param priority: Execution priority; higher values run first.
         :param enabled: Whether the rule participates in execution.
         :param description: Human-readable description of the rule.
+        :param cost: Expected evaluation time in seconds, see *budget* of :meth:`execute`.
         :raises DuplicateRuleNameError: If *rulename* is already registered.
+        :raises SyntaxError: If *optimize* is enabled (and *lazy* is not) and an expression is not valid Python syntax.
         """
         if rulename in self.rules:
             raise DuplicateRuleNameError(rulename)
         rule = self._make_rule(rulename, priority)
         rule.enabled = enabled
-        rule.description = description
-        rule.conditions.append(condition)
-        rule.actions.append(action)
+        rule.description = sys.intern(description)
+        rule.cost = cost
+        rule.conditions = [sys.intern(condition)]
+        rule.actions = [sys.intern(action)]
+        self._prepare_rule(rule)
         self.rules[rulename] = rule
+        self.version += 1
 
     @classmethod
-    def register_function(cls, function: Callable[..., object], function_name: str | None = None) -> None:
+    def register_function(
+        cls,
+        function: Callable[..., object],
+        function_name: str | None = None,
+        *,
+        bulk: bool = False,
+    ) -> None:
         """Register a callable for use inside rule expressions.
 
         :param function: Callable to make available in expressions.
         :param function_name: Name to use inside expressions; defaults to ``function.__name__``.
+        :param bulk: The function is bulk-capable: it takes a list of argument tuples and
+            returns one result per tuple.  Actions calling it are coalesced across the
+            records of :meth:`execute_batch`; a call outside a batch is passed on as a batch of one.
         """
         name = function_name or function.__name__
-        cls.CUSTOM_FUNCTIONS[name] = function
+        cls.CUSTOM_FUNCTIONS[name] = BulkFunction(function, name) if bulk else function
 
     @classmethod
     def unregister_function(cls, function_name: str) -> None:
@@ -200,10 +281,57 @@ class RuleParser:
         :raises KeyError: If no rule with *rulename* is registered.
         """
         del self.rules[rulename]
+        self.version += 1
+        self.optimization_report.rules.pop(rulename, None)
 
     def clear_rules(self) -> None:
         """Remove all registered rules from this parser instance."""
         self.rules.clear()
+        self.version += 1
+        self.expressions.clear()
+        self.optimization_report.rules.clear()
+
+    def validate_all(self) -> dict[str, Exception]:
+        """Parse, validate and prepare every rule now, including rules deferred by *lazy*.
+
+        :returns: The error of every rule that could not be prepared, by rule name; empty
+            if all rules are valid.  Failed rules raise the same error when they are evaluated.
+        """
+        errors: dict[str, Exception] = {}
+        for rule in self.rules.values():
+            try:
+                rule.prepare()
+                rule.compile()
+            except Exception as e:  # noqa: BLE001 - every error is reported to the caller
+                errors[rule.rulename] = e
+        return errors
+
+    def warm_up(self, limit: int | None = None, *, background: bool = False) -> threading.Thread | None:
+        """Prepare the enabled rules of a *lazy* parser ahead of their first evaluation.
+
+        Rules are prepared in evaluation order, so the highest-priority rules are ready
+        first.  Rules that fail to prepare are skipped and raise when they are evaluated.
+
+        :param limit: Prepare at most this many rules.
+        :param background: Prepare the rules in a daemon thread instead of blocking.
+        :returns: The started thread if *background* is ``True``, else ``None``.
+        """
+        rules = self._enabled_rules()[:limit]
+        if not background:
+            _prepare_all(rules)
+            return None
+        thread = threading.Thread(target=_prepare_all, args=(rules,), name="rule-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def memory_footprint(self) -> MemoryFootprint:
+        """Measure the memory used by the rules of this parser.
+
+        Walks every rule, so this is meant for monitoring and capacity planning, not the hot path.
+
+        :returns: :class:`~business_rule_engine.MemoryFootprint` with byte counts and ``bytes_per_rule``.
+        """
+        return measure_footprint(self.rules, self.expressions, exclude=(RuleParser.CUSTOM_FUNCTIONS,))
 
     def __len__(self) -> int:
         """Return the number of registered rules."""
@@ -217,6 +345,110 @@ class RuleParser:
         """Iterate over registered rules in insertion order."""
         return iter(self.rules.values())
 
+    def _priority_bands(self) -> BandPlan:
+        """Return the band plan of the enabled rules, rebuilt only when the rules or their priorities change."""
+        rules = self._enabled_rules()
+        key = tuple((rule, rule.priority) for rule in rules)
+        cached = self._band_plan
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        _prepare_all(rules)
+        plan = band_plan(rules)
+        self._band_plan = (key, plan)
+        return plan
+
+    def _enabled_rules(self) -> list[Rule]:
+        """Return the enabled rules in evaluation order (descending priority, then insertion order)."""
+        return [rule for rule in sorted(self.rules.values(), key=lambda r: r.priority, reverse=True) if rule.enabled]
+
+    def build_decision_tree(self, *, max_leaf_size: int = 4, max_depth: int = 32) -> DecisionTree:
+        """Compile the enabled rules into a :class:`~business_rule_engine.DecisionTree`.
+
+        The tree selects the same rule as :meth:`execute` with ``stop_on_first_trigger=True``
+        whenever that does not raise, but branches on parameter values instead of testing
+        every rule in turn.  Errors for missing or mistyped parameters may differ, see
+        :meth:`DecisionTree.execute <business_rule_engine.DecisionTree.execute>`.  It is a
+        snapshot of the current rules and has to be rebuilt after rules are changed.
+
+        :param max_leaf_size: Stop branching once a node holds at most this many candidate rules.
+        :param max_depth: Maximum number of branches on the way from the root to a leaf.
+        :returns: The compiled decision tree.
+        """
+        rules = self._enabled_rules()
+        _prepare_all(rules)
+        return DecisionTree(rules, max_leaf_size=max_leaf_size, max_depth=max_depth)
+
+    def freeze(self, *, gc_freeze: bool = False) -> FrozenRuleSet:
+        """Create an immutable, fully prepared snapshot of the rules and registered functions.
+
+        The snapshot is not affected by later changes to this parser, its rules or
+        :attr:`CUSTOM_FUNCTIONS`, and can be executed by many threads without locking.
+        Swap snapshots atomically with :class:`~business_rule_engine.RuleSetHolder`.
+
+        :param gc_freeze: Collect garbage and move all objects alive now, including the
+            snapshot, into the permanent generation (:func:`gc.freeze`).  Use this in the
+            master process of a pre-fork server right before forking, so that garbage
+            collections in the workers do not write to the pages they share with the master.
+        :returns: The frozen rule set.
+        :raises SyntaxError: If an expression is not valid Python syntax.
+        """
+        for rule in self.rules.values():
+            rule.prepare()
+        snapshot = FrozenRuleSet(self.rules.values(), RuleParser.CUSTOM_FUNCTIONS, version=self.version)
+        if gc_freeze:
+            gc.collect()
+            gc.freeze()
+        return snapshot
+
+    def match(self, params: Mapping[str, object], *, set_default_arg: bool = False, default_arg: object = None) -> int:
+        """Evaluate the conditions of all enabled rules without running any action.
+
+        :param params: Named values available to the conditions.
+        :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
+        :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :returns: Bitset with bit ``i`` set if the ``i``-th rule of :attr:`rules` (insertion
+            order) matched.  The order is stable as long as :attr:`version` does not change.
+        :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
+        :raises ConditionReturnValueError: If a condition does not return a boolean value.
+        """
+        return match_rules(match_plan(self.rules.values()), params, set_default_arg=set_default_arg, default_arg=default_arg)
+
+    def match_batch(
+        self,
+        records: Iterable[Mapping[str, object]],
+        *,
+        set_default_arg: bool = False,
+        default_arg: object = None,
+    ) -> MatchMatrix:
+        """Run :meth:`match` for every record and collect the bitsets in a compact 2-D bitmap.
+
+        :param records: Parameter mappings, one per record.
+        :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
+        :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :returns: :class:`~business_rule_engine.MatchMatrix` with one row per record.
+        :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
+        :raises ConditionReturnValueError: If a condition does not return a boolean value.
+        """
+        plan = match_plan(self.rules.values())
+        matrix = MatchMatrix(list(self.rules), self.version)
+        for params in records:
+            matrix.append(match_rules(plan, params, set_default_arg=set_default_arg, default_arg=default_arg))
+        return matrix
+
+    def shard(self, shards: int, *, partition: Partition = "priority") -> ShardedRuleSet:
+        """Partition the enabled rules across worker processes for scatter-gather execution.
+
+        See :class:`~business_rule_engine.ShardedRuleSet`.  The shards are a snapshot of
+        the current rules; close the returned object to stop the workers.
+
+        :param shards: Number of worker processes.
+        :param partition: ``"priority"`` for contiguous priority bands, ``"hash"`` to spread rules by name.
+        :returns: The running sharded rule set.
+        """
+        rules = self._enabled_rules()
+        _prepare_all(rules)
+        return ShardedRuleSet(rules, shards=shards, partition=partition)
+
     def execute(
         self,
         params: Mapping[str, object],
@@ -224,48 +456,108 @@ class RuleParser:
         stop_on_first_trigger: bool = True,
         set_default_arg: bool = False,
         default_arg: object = None,
+        explain: bool = False,
+        budget: float | None = None,
+        stop_on_first_band: bool = False,
     ) -> ExecutionResult:
         """Evaluate all enabled rules against the given parameters.
 
         Rules are sorted by descending priority before evaluation.
 
+        With *stop_on_first_band*, rules of equal priority form a band: all rules of the
+        highest band with a triggered rule fire, and the lower bands are not evaluated.
+        Sub-expressions shared by several conditions, such as ``order.total > 100``, are
+        evaluated once and reused by the following conditions until a function is called
+        or a rule fires.
+
+        With a *budget*, the elapsed time is checked before every rule and every action.
+        Once the budget is used up, evaluation stops and the partial result is flagged as
+        :attr:`~business_rule_engine.ExecutionResult.truncated`.  A rule whose
+        :attr:`~business_rule_engine.Rule.cost` exceeds the remaining budget is skipped
+        while cheaper rules are still evaluated.  A single condition or action that is
+        already running is never interrupted.
+
         :param params: Named values available to all rule expressions.
         :param stop_on_first_trigger: Stop after the first rule whose condition is satisfied.
         :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
         :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :param explain: Record a :class:`~business_rule_engine.RuleTrace` for every evaluated rule
+            in :attr:`ExecutionResult.trace <business_rule_engine.ExecutionResult.trace>`.
+        :param budget: Time budget for this call in seconds.
+        :param stop_on_first_band: Stop after the highest priority band with a triggered rule;
+            takes precedence over *stop_on_first_trigger*.
         :returns: :class:`~business_rule_engine.ExecutionResult` containing per-rule results.
             Evaluates as ``True`` when at least one rule was triggered.
         :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
         :raises ConditionReturnValueError: If a condition does not return a boolean value.
         """
-        results: list[RuleResult] = []
-        sorted_rules = sorted(self.rules.values(), key=lambda r: r.priority, reverse=True)
-
-        for rule in sorted_rules:
-            if not rule.enabled:
-                continue
-
-            logger.debug("Rule name: %s", rule.rulename)
-            logger.debug("Conditions: %s", rule.conditions)
-            logger.debug("Actions: %s", rule.actions)
-
-            condition_result, action_results = rule.execute(
+        if self.recorder is not None:
+            self.recorder.record(params, {
+                "stop_on_first_trigger": stop_on_first_trigger,
+                "set_default_arg": set_default_arg,
+                "default_arg": default_arg,
+                "budget": budget,
+                "stop_on_first_band": stop_on_first_band,
+            })
+        if stop_on_first_band:
+            return execute_bands(
+                self._priority_bands(),
                 params,
                 set_default_arg=set_default_arg,
                 default_arg=default_arg,
+                explain=explain,
+                budget=budget,
             )
+        return execute_rules(
+            self._enabled_rules(),
+            params,
+            stop_on_first_trigger=stop_on_first_trigger,
+            set_default_arg=set_default_arg,
+            default_arg=default_arg,
+            explain=explain,
+            budget=budget,
+        )
 
-            results.append(RuleResult(
-                rule_name=rule.rulename,
-                triggered=bool(rule.status),
-                condition_result=condition_result,
-                action_result=action_results,
-            ))
-
-            if rule.status:
-                if stop_on_first_trigger:
-                    logger.debug("Stop on first trigger")
-                    break
-                logger.debug("continue with next rule")
-
-        return ExecutionResult(results)
+    def execute_batch(
+        self,
+        records: Iterable[Mapping[str, object]],
+        *,
+        stop_on_first_trigger: bool = True,
+        set_default_arg: bool = False,
+        default_arg: object = None,
+        max_pending: int | None = None,
+        max_delay: float | None = None,
+    ) -> list[ExecutionResult]:
+        """Execute the rules for every record and dispatch calls of bulk functions together.
+
+        Actions consisting of a single call of a function registered with ``bulk=True``
+        are recorded instead of executed.  The recorded calls are passed to each bulk
+        function in one invocation at the end of the batch, or earlier when
+        *max_pending* or *max_delay* is reached, and the returned values are filled into
+        the ``action_result`` of the records.  All other actions run immediately.
+        If a record raises, the calls recorded since the last flush are not dispatched.
+
+        :param records: Parameter mappings, one per record.
+        :param stop_on_first_trigger: Stop after the first rule whose condition is satisfied.
+        :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
+        :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :param max_pending: Flush once this many calls are recorded.
+        :param max_delay: Flush once the oldest recorded call is this many seconds old.
+        :returns: One :class:`~business_rule_engine.ExecutionResult` per record, in order.
+        :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
+        :raises ConditionReturnValueError: If a condition does not return a boolean value.
+        :raises BulkFunctionError: If a bulk function does not return one result per call.
+        """
+        rules = self._enabled_rules()
+        return execute_batch(
+            lambda params: execute_rules(
+                rules,
+                params,
+                stop_on_first_trigger=stop_on_first_trigger,
+                set_default_arg=set_default_arg,
+                default_arg=default_arg,
+            ),
+            records,
+            max_pending=max_pending,
+            max_delay=max_delay,
+        )
@@ -0,0 +1,198 @@
+"""Precompiled access paths for nested parameters.
+
+Attribute and constant-subscript chains on a parameter (``order.customer.country``,
+``item["sku"]``) are compiled into an :class:`AccessPath` when an expression is parsed,
+and the chain is replaced by a single :class:`PathName`.  The value of the path is then resolved
+at most once per execution by :class:`Names` and shared by all rules that use it.
+"""
+
+from __future__ import annotations
+
+import ast
+import types
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+from simpleeval import DISALLOW_FUNCTIONS, DISALLOW_METHODS, DISALLOW_PREFIXES, FeatureNotAvailable
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class _Step(NamedTuple):
+    attribute: bool
+    key: object
+
+
+class AccessPath(NamedTuple):
+    """Chain of attribute and item accesses starting at a parameter."""
+
+    root: str
+    steps: tuple[_Step, ...]
+
+    def resolve(self, names: Mapping[str, object], functions: Mapping[str, object] | None = None) -> object:
+        """Return the value at the end of the path, the same way the evaluator would.
+
+        Attribute access falls back to item access (``order.customer`` works for dicts).
+        A root that is not a parameter is looked up in *functions*, so that paths on
+        registered functions and objects (``cfg.limit``) work.
+
+        :param names: Names available to the expression.
+        :param functions: Callables available to the expression.
+        :raises KeyError: If the root name or any step along the path does not exist.
+        """
+        if functions is not None and self.root not in names and self.root in functions:
+            value = functions[self.root]
+        else:
+            value = names[self.root]
+        for step in self.steps:
+            if step.attribute:
+                try:
+                    value = getattr(value, step.key)  # type: ignore[call-overload]
+                except (AttributeError, TypeError):
+                    try:
+                        value = value[step.key]  # type: ignore[index]
+                    except (KeyError, TypeError) as e:
+                        raise KeyError(step.key) from e
+                if isinstance(value, types.ModuleType):
+                    msg = "Sorry, modules are not allowed in attribute access"
+                    raise FeatureNotAvailable(msg)
+                if callable(value) and value in DISALLOW_FUNCTIONS:
+                    msg = "This function is forbidden"
+                    raise FeatureNotAvailable(msg)
+            else:
+                try:
+                    value = value[step.key]  # type: ignore[index]
+                except (KeyError, IndexError, TypeError) as e:
+                    raise KeyError(step.key) from e
+        return value
+
+
+class PathName(str):  # noqa: SLOT000 - str subclasses cannot have non-empty __slots__
+    """Name of a compiled access path in parsed expressions.
+
+    It prints as the source of the chain (``order.total``) but never equals a plain
+    string, so a parameter whose key happens to be ``"order.total"`` cannot shadow or
+    stand in for the path.
+    """
+
+    path: AccessPath
+
+    def __new__(cls, source: str, path: AccessPath) -> Self:
+        """Create the name of *path*, spelled as *source*."""
+        name = super().__new__(cls, source)
+        name.path = path
+        return name
+
+    def __getnewargs__(self) -> tuple[str, AccessPath]:  # type: ignore[override]
+        """Support pickling, e.g. when rules are sent to other processes."""
+        return (str(self), self.path)
+
+    def __eq__(self, other: object) -> bool:
+        """Return ``True`` for a path name with the same source."""
+        return type(other) is PathName and str.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        """Return ``True`` unless *other* is a path name with the same source."""
+        return not self == other
+
+    def __hash__(self) -> int:
+        """Hash differently from the plain string with the same text."""
+        return hash((PathName, str(self)))
+
+
+def access_path(name: str) -> AccessPath | None:
+    """Return the compiled path that *name* stands for, or ``None`` for a plain name."""
+    return name.path if type(name) is PathName else None
+
+
+def _allowed_attribute(attr: str) -> bool:
+    return not attr.startswith(tuple(DISALLOW_PREFIXES)) and attr not in DISALLOW_METHODS
+
+
+def compile_path(
+    node: ast.AST,
+    bound: frozenset[str] = frozenset(),
+    paths: dict[str, PathName] | None = None,
+) -> ast.Name | None:
+    """Replace an attribute/constant-subscript chain on a parameter with a single name.
+
+    :param node: Expression node.
+    :param bound: Names bound by an enclosing comprehension; chains on them are left alone.
+    :param paths: Path names by source, reused so that each distinct path is compiled once.
+    :returns: The replacement name node, or ``None`` if *node* is not such a chain.
+    """
+    steps: list[_Step] = []
+    current = node
+    while True:
+        if isinstance(current, ast.Attribute) and _allowed_attribute(current.attr):
+            steps.append(_Step(attribute=True, key=current.attr))
+        elif isinstance(current, ast.Subscript) and isinstance(current.slice, ast.Constant):
+            steps.append(_Step(attribute=False, key=current.slice.value))
+        else:
+            break
+        current = current.value
+    if not steps or not isinstance(current, ast.Name) or current.id in bound:
+        return None
+    source = ast.unparse(node)
+    name = paths.get(source) if paths is not None else None
+    if name is None:
+        name = PathName(source, AccessPath(current.id, tuple(reversed(steps))))
+        if paths is not None:
+            paths[source] = name
+    return ast.Name(id=name, ctx=ast.Load())
+
+
+class Names(dict[str, object]):
+    """Names available to the expressions of one execution.
+
+    Holds the parameters, resolves compiled access paths on first use and keeps
+    their values until :meth:`forget_paths` is called, so every path is resolved at
+    most once between two actions.
+    """
+
+    __slots__ = ("_resolved", "default_arg", "functions", "set_default_arg")
+
+    def __init__(
+        self,
+        params: Mapping[str, object],
+        *,
+        set_default_arg: bool,
+        default_arg: object,
+        functions: Mapping[str, object] | None = None,
+    ) -> None:
+        """Initialize with the parameters of one execution.
+
+        :param params: Named values available to the expressions.
+        :param set_default_arg: Substitute *default_arg* for missing names and paths.
+        :param default_arg: Value used for missing names when *set_default_arg* is ``True``.
+        :param functions: Callables available to the expressions; roots of paths that are
+            not parameters are looked up here.
+        """
+        super().__init__(params)
+        self.set_default_arg = set_default_arg
+        self.default_arg = default_arg
+        self.functions = functions
+        self._resolved: list[str] = []
+
+    def __missing__(self, key: str) -> object:
+        """Resolve an access path, or return the default value for a missing name."""
+        path = key.path if type(key) is PathName else None
+        if path is not None:
+            try:
+                value = path.resolve(self, self.functions)
+            except KeyError:
+                if not self.set_default_arg:
+                    raise
+                value = self.default_arg
+            self[key] = value
+            self._resolved.append(key)
+            return value
+        if self.set_default_arg:
+            return self.default_arg
+        raise KeyError(key)
+
+    def forget_paths(self) -> None:
+        """Drop the resolved path values, e.g. after an action that may have changed the parameters."""
+        for key in self._resolved:
+            self.pop(key, None)
+        self._resolved.clear()
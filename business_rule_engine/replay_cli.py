@@ -0,0 +1,8 @@
+"""Entry point for ``python -m business_rule_engine.replay_cli``."""
+
+import sys
+
+from business_rule_engine.workload import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,18 +21,66 @@ class RuleResult:
     action_result: list[object]
 
 
+@dataclass
+class TermTrace:
+    """Value of one top-level sub-expression of a rule condition.
+
+    :param expression: Source of the sub-expression.
+    :param value: Value the sub-expression evaluated to.
+    """
+
+    expression: str
+    value: object
+
+
+@dataclass
+class RuleTrace:
+    """Structured record of a single rule evaluation, collected with ``explain=True``.
+
+    :param rule_name: Name of the evaluated rule.
+    :param params: Values of the parameters referenced by the rule, in order of appearance.
+    :param terms: Operands of the top-level ``and``/``or`` of the condition (or the whole
+        condition) in evaluation order; operands skipped by short-circuiting are not listed.
+    :param condition_result: Boolean result of the condition expression.
+    :param action_result: Return values from each executed action, in order.
+    :param condition_seconds: Time spent evaluating the condition.
+    :param action_seconds: Time spent executing the actions.
+    """
+
+    rule_name: str
+    params: dict[str, object]
+    terms: list[TermTrace]
+    condition_result: bool
+    action_result: list[object]
+    condition_seconds: float
+    action_seconds: float
+
+
 class ExecutionResult:
     """Aggregated result of running a rule set via :class:`~business_rule_engine.RuleParser`.
 
     Evaluates as ``True`` in a boolean context when at least one rule was triggered.
     """
 
-    def __init__(self, results: list[RuleResult]) -> None:
+    def __init__(
+        self,
+        results: list[RuleResult],
+        *,
+        trace: list[RuleTrace] | None = None,
+        truncated: bool = False,
+        not_evaluated: list[str] | None = None,
+    ) -> None:
         """Initialize the execution result.
 
         :param results: Per-rule results in evaluation order.
+        :param trace: Per-rule traces in evaluation order, only recorded with ``explain=True``.
+        :param truncated: Evaluation was cut short by the time budget; the results are partial.
+        :param not_evaluated: Names of the rules skipped because of the time budget, in evaluation order.
         """
         self.results = results
+        self.trace = trace
+        self.truncated = truncated
+        self.not_evaluated = not_evaluated if not_evaluated is not None else []
 
     def __bool__(self) -> bool:
         """Return ``True`` if at least one rule was triggered."""
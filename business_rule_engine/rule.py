@@ -2,28 +2,25 @@
 
 from __future__ import annotations
 
+import ast
+import time
 from typing import TYPE_CHECKING
 
-from simpleeval import EvalWithCompoundTypes, NameNotDefined
+from simpleeval import EvalWithCompoundTypes, NameNotDefined, SimpleEval
 
+from business_rule_engine.bulk import BulkFunction, current_batch
 from business_rule_engine.exceptions import (
     ConditionReturnValueError,
     MissingArgumentError,
 )
+from business_rule_engine.expressions import ExpressionCache
+from business_rule_engine.paths import Names, access_path
+from business_rule_engine.results import RuleTrace, TermTrace
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Mapping
 
-
-class _DefaultNames(dict[str, object]):
-    def __init__(self, data: dict[str, object], default: object) -> None:
-        """Initialize with data and a fallback value for missing keys."""
-        super().__init__(data)
-        self._default = default
-
-    def __missing__(self, key: str) -> object:
-        """Return the default value for any missing key."""
-        return self._default
+    from business_rule_engine.bands import TermMemo
 
 
 class Rule:
@@ -33,6 +30,21 @@ class Rule:
     When satisfied, all registered action expressions are executed in order.
     """
 
+    __slots__ = (
+        "_expressions",
+        "_functions",
+        "_prepare",
+        "actions",
+        "condition_requires_bool",
+        "conditions",
+        "cost",
+        "description",
+        "enabled",
+        "priority",
+        "rulename",
+        "status",
+    )
+
     def __init__(
         self,
         rulename: str,
@@ -41,7 +53,9 @@ class Rule:
         priority: int = 0,
         enabled: bool = True,
         description: str = "",
+        cost: float = 0.0,
         functions: dict[str, Callable[..., object]] | None = None,
+        expressions: ExpressionCache | None = None,
     ) -> None:
         """Initialize a rule.
 
@@ -51,25 +65,101 @@ class Rule:
         :param priority: Execution priority; higher values are evaluated first.
         :param enabled: Whether this rule participates in execution.
         :param description: Human-readable description of the rule.
+        :param cost: Expected evaluation time in seconds; rules that do not fit into the
+            remaining time budget of :meth:`RuleParser.execute` are skipped.
         :param functions: Mapping of callables available inside rule expressions.
+        :param expressions: Cache of parsed expressions; pass the same cache to many rules
+            so that identical expressions are parsed and stored only once.
         """
         self.rulename = rulename
         self.condition_requires_bool = condition_requires_bool
         self.priority = priority
         self.enabled = enabled
         self.description = description
+        self.cost = cost
         self.conditions: list[str] = []
         self.actions: list[str] = []
         self.status: bool | None = None
         self._functions: dict[str, Callable[..., object]] = functions if functions is not None else {}
+        self._expressions = expressions if expressions is not None else ExpressionCache()
+        self._prepare: Callable[[Rule], None] | None = None
+
+    def defer_preparation(self, prepare: Callable[[Rule], None]) -> None:
+        """Run *prepare* on this rule right before it is evaluated for the first time.
+
+        :param prepare: Callable that parses, validates or compiles the rule.
+        """
+        self._prepare = prepare
+
+    def prepare(self) -> None:
+        """Run the deferred preparation now, if there is one.
+
+        If the preparation raises, it stays pending and is retried on the next evaluation.
+        """
+        prepare = self._prepare
+        if prepare is None:
+            return
+        prepare(self)
+        self._prepare = None
+
+    @property
+    def prepared(self) -> bool:
+        """``False`` while a deferred preparation is pending."""
+        return self._prepare is None
+
+    @property
+    def condition(self) -> str:
+        """All ``when`` lines joined into the single expression that is evaluated."""
+        return " ".join(self.conditions)
+
+    def compile(self, transform: Callable[[ast.AST], ast.AST] | None = None) -> None:
+        """Parse the condition and action expressions ahead of their first evaluation.
+
+        Expressions are otherwise parsed lazily and cached on first use.
+
+        :param transform: Optional rewrite applied to each parsed expression, e.g. an optimizer pass.
+        :raises SyntaxError: If an expression is not valid Python syntax.
+        """
+        for expression in (self.condition, *self.actions):
+            if not expression.strip():
+                continue
+            if transform is not None:
+                self._expressions.add(expression, transform(SimpleEval.parse(expression)))
+            elif expression not in self._expressions:
+                self._expressions.get(expression)
+
+    def parsed_condition(self) -> ast.AST:
+        """Return the parsed (and possibly optimized) condition expression."""
+        return self._expressions.get(self.condition)
 
-    def _build_names(self, params: Mapping[str, object], *, set_default_arg: bool, default_arg: object) -> dict[str, object]:
-        if set_default_arg:
-            return _DefaultNames(dict(params), default_arg)
-        return dict(params)
+    @property
+    def functions(self) -> Mapping[str, Callable[..., object]]:
+        """Callables available to the expressions of this rule."""
+        return self._functions
 
-    def _evaluate(self, expression: str, names: dict[str, object]) -> object:
-        return EvalWithCompoundTypes(names=names, functions=self._functions).eval(expression)
+    def _build_names(self, params: Mapping[str, object], *, set_default_arg: bool, default_arg: object) -> Names:
+        # A Names instance passed as params was built for the whole execution and is shared by all rules.
+        if type(params) is Names:
+            return params
+        return Names(params, set_default_arg=set_default_arg, default_arg=default_arg, functions=self._functions)
+
+    def _evaluate(self, expression: str, names: dict[str, object], terms: TermMemo | None = None) -> object:
+        if terms is not None:
+            evaluator = terms.evaluator(names, self._functions)
+        else:
+            evaluator = EvalWithCompoundTypes(names=names, functions=self._functions)
+        return evaluator.eval(expression, self._expressions.get(expression))
+
+    def _bulk_call(self, expression: str) -> tuple[BulkFunction, list[ast.expr]] | None:
+        """Return the bulk function and argument nodes if *expression* is a single call of a bulk function."""
+        node = self._expressions.get(expression)
+        call = node.value if isinstance(node, ast.Expr) else node
+        if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name)) or call.keywords:
+            return None
+        function = self._functions.get(call.func.id)
+        if not isinstance(function, BulkFunction) or any(isinstance(arg, ast.Starred) for arg in call.args):
+            return None
+        return function, call.args
 
     def check_condition(
         self,
@@ -87,16 +177,23 @@ class Rule:
         :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
         :raises ConditionReturnValueError: If the condition does not return a boolean value.
         """
-        names = self._build_names(params, set_default_arg=set_default_arg, default_arg=default_arg)
-        condition = " ".join(self.conditions)
+        self.status = self._check(self._build_names(params, set_default_arg=set_default_arg, default_arg=default_arg))
+        return self.status
+
+    def _check(self, names: Names, terms: TermMemo | None = None) -> bool:
+        """Evaluate the condition like :meth:`check_condition`, without recording :attr:`status`.
+
+        :param terms: Memo of shared terms already evaluated for the same *names*.
+        """
+        if self._prepare is not None:
+            self.prepare()
         try:
-            result = self._evaluate(condition, names)
+            result = self._evaluate(self.condition, names, terms)
         except NameNotDefined as e:
             raise MissingArgumentError(str(e)) from e
         if self.condition_requires_bool and not isinstance(result, bool):
             raise ConditionReturnValueError(self.rulename)
-        self.status = bool(result)
-        return self.status
+        return bool(result)
 
     def run_action(
         self,
@@ -104,22 +201,45 @@ class Rule:
         *,
         set_default_arg: bool = False,
         default_arg: object = None,
+        deadline: float | None = None,
     ) -> list[object]:
         """Execute all registered action expressions and return their results.
 
         :param params: Named values available to each action expression.
         :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
         :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
-        :returns: List of return values, one per action expression, in order.
+        :param deadline: :func:`time.perf_counter` value after which no further action is started.
+        Access paths resolved so far are resolved again after every action, so later
+        expressions see the changes an action made to nested parameters.
+
+        :returns: List of return values, one per action expression, in order.  Shorter than
+            :attr:`actions` if the *deadline* passed before all actions were executed.
+            During :meth:`RuleParser.execute_batch <business_rule_engine.RuleParser.execute_batch>`,
+            a call of a bulk function is recorded and its result is filled in when the batch is flushed.
         :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
         """
+        if self._prepare is not None:
+            self.prepare()
         names = self._build_names(params, set_default_arg=set_default_arg, default_arg=default_arg)
+        batch = current_batch()
         results: list[object] = []
         for action in self.actions:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            result: object
             try:
-                result = self._evaluate(action, names)
+                bulk_call = self._bulk_call(action) if batch is not None else None
+                if bulk_call is not None and batch is not None:
+                    function, arg_nodes = bulk_call
+                    evaluator = EvalWithCompoundTypes(names=names, functions=self._functions)
+                    result = batch.defer(function, tuple(evaluator.eval(action, arg) for arg in arg_nodes))
+                else:
+                    result = self._evaluate(action, names)
             except NameNotDefined as e:
                 raise MissingArgumentError(str(e)) from e
+            finally:
+                # The action may have changed the objects that resolved paths point into.
+                names.forget_paths()
             results.append(result)
         return results
 
@@ -129,19 +249,140 @@ class Rule:
         *,
         set_default_arg: bool = False,
         default_arg: object = None,
+        deadline: float | None = None,
     ) -> tuple[bool, list[object]]:
         """Evaluate the condition and, if satisfied, execute all actions.
 
         :param params: Named values available to condition and action expressions.
         :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
         :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :param deadline: :func:`time.perf_counter` value after which no further action is started.
         :returns: A tuple of ``(condition_result, action_results)``.
             The action list is empty when the condition is not satisfied.
         :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
         :raises ConditionReturnValueError: If the condition does not return a boolean value.
         """
-        condition_result = self.check_condition(params, set_default_arg=set_default_arg, default_arg=default_arg)
-        if not self.status:
-            return condition_result, []
-        action_results = self.run_action(params, set_default_arg=set_default_arg, default_arg=default_arg)
+        names = self._build_names(params, set_default_arg=set_default_arg, default_arg=default_arg)
+        return self._execute(names, deadline=deadline)
+
+    def _execute(
+        self,
+        names: Names,
+        *,
+        deadline: float | None = None,
+        terms: TermMemo | None = None,
+    ) -> tuple[bool, list[object]]:
+        """Run the rule like :meth:`execute`; called by the shared evaluation loops.
+
+        :param terms: Memo of shared terms used to evaluate the condition; cleared before the actions run.
+        """
+        condition_result, action_results = self._run(names, deadline=deadline, terms=terms)
+        self.status = condition_result
         return condition_result, action_results
+
+    def _run(
+        self,
+        names: Names,
+        *,
+        deadline: float | None = None,
+        terms: TermMemo | None = None,
+    ) -> tuple[bool, list[object]]:
+        """Run the rule like :meth:`execute`, without recording :attr:`status`."""
+        if not self._check(names, terms):
+            return False, []
+        if terms is not None:
+            # The actions may change the objects the memoized terms refer to.
+            terms.clear()
+        return True, self.run_action(names, deadline=deadline)
+
+    def _referenced_params(self, names: dict[str, object]) -> dict[str, object]:
+        nodes = [self.parsed_condition(), *(self._expressions.get(action) for action in self.actions)]
+        referenced: dict[str, object] = {}
+        for name in dict.fromkeys(n.id for node in nodes for n in ast.walk(node) if isinstance(n, ast.Name)):
+            if access_path(name) is not None:
+                # Only report paths the evaluation has resolved; resolving others may raise.
+                if dict.__contains__(names, name):
+                    referenced[str(name)] = dict.__getitem__(names, name)
+                continue
+            if name in self._functions and name not in names:
+                continue
+            try:
+                referenced[name] = names[name]
+            except KeyError:
+                continue
+        return referenced
+
+    def explain(
+        self,
+        params: Mapping[str, object],
+        *,
+        set_default_arg: bool = False,
+        default_arg: object = None,
+        deadline: float | None = None,
+    ) -> RuleTrace:
+        """Evaluate the rule like :meth:`execute` and record how the result came about.
+
+        The operands of a top-level ``and``/``or`` in the condition are evaluated one by
+        one with the same short-circuit semantics, so that each intermediate value can be
+        recorded without evaluating anything twice.
+
+        :param params: Named values available to condition and action expressions.
+        :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
+        :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :param deadline: :func:`time.perf_counter` value after which no further action is started.
+        :returns: :class:`~business_rule_engine.RuleTrace` with parameter values, term values and timings.
+        :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
+        :raises ConditionReturnValueError: If the condition does not return a boolean value.
+        """
+        names = self._build_names(params, set_default_arg=set_default_arg, default_arg=default_arg)
+        return self._explain(names, deadline=deadline)
+
+    def _explain(self, names: Names, *, deadline: float | None = None) -> RuleTrace:
+        """Explain the rule like :meth:`explain`; called by the shared evaluation loops."""
+        trace = self._trace(names, deadline=deadline)
+        self.status = trace.condition_result
+        return trace
+
+    def _trace(self, names: Names, *, deadline: float | None = None) -> RuleTrace:
+        """Explain the rule like :meth:`explain`, without recording :attr:`status`."""
+        if self._prepare is not None:
+            self.prepare()
+        condition = self.parsed_condition()
+        expression = condition.value if isinstance(condition, ast.Expr) else condition
+        if isinstance(expression, ast.BoolOp):
+            operands: list[tuple[str, ast.AST]] = [(ast.unparse(value), value) for value in expression.values]
+            stop_on = not isinstance(expression.op, ast.And)
+        else:
+            operands = [(self.condition, condition)]
+            stop_on = None
+        evaluator = EvalWithCompoundTypes(names=names, functions=self._functions)
+        terms: list[TermTrace] = []
+        start = time.perf_counter()
+        try:
+            for source, operand in operands:
+                result = evaluator.eval(source, operand)
+                terms.append(TermTrace(source, result))
+                if bool(result) is stop_on:
+                    break
+        except NameNotDefined as e:
+            raise MissingArgumentError(str(e)) from e
+        condition_seconds = time.perf_counter() - start
+        if self.condition_requires_bool and not isinstance(result, bool):
+            raise ConditionReturnValueError(self.rulename)
+        condition_result = bool(result)
+        referenced = self._referenced_params(names)
+
+        start = time.perf_counter()
+        action_results: list[object] = []
+        if condition_result:
+            action_results = self.run_action(names, deadline=deadline)
+        action_seconds = time.perf_counter() - start
+        return RuleTrace(
+            rule_name=self.rulename,
+            params=referenced,
+            terms=terms,
+            condition_result=condition_result,
+            action_result=action_results,
+            condition_seconds=condition_seconds,
+            action_seconds=action_seconds,
+        )
@@ -0,0 +1,262 @@
+"""Scatter-gather execution of a rule set partitioned across worker processes.
+
+Each shard process holds a part of the enabled rules together with their position
+in the global evaluation order.  The params of a request are broadcast to all shards,
+the shards evaluate their rules in parallel, and the partial results are merged
+in global order, so the outcome is the same as a linear
+:meth:`~business_rule_engine.RuleParser.execute`.
+
+With ``stop_on_first_trigger=True`` the shards only evaluate conditions.  A shard
+stops at its first triggered rule and publishes its position; other shards stop
+as soon as they reach a rule positioned after the best trigger found so far.  Only
+the actions of the winning rule are then executed, by its shard.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import pickle
+import sys
+import threading
+import zlib
+from typing import TYPE_CHECKING, Literal, NamedTuple, Self, cast
+
+from business_rule_engine.exceptions import ShardError
+from business_rule_engine.execution import build_names
+from business_rule_engine.results import ExecutionResult, RuleResult
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+    from multiprocessing.sharedctypes import Synchronized
+    from types import TracebackType
+
+    from business_rule_engine.rule import Rule
+
+Partition = Literal["priority", "hash"]
+
+_NO_TRIGGER = sys.maxsize
+
+
+class _Evaluated(NamedTuple):
+    position: int
+    condition_result: bool
+    action_result: list[object]
+
+
+class _Failed(NamedTuple):
+    position: int
+    error: BaseException
+
+
+def _transferable(error: BaseException) -> BaseException:
+    """Return *error* if it survives pickling, else a :class:`ShardError` carrying its message."""
+    try:
+        pickle.loads(pickle.dumps(error))  # noqa: S301 - round trip of an object created here
+    except Exception:  # noqa: BLE001 - any pickling failure is handled the same way
+        return ShardError(f"{type(error).__name__}: {error}")
+    return error
+
+
+def _evaluate_shard(
+    rules: Sequence[tuple[int, Rule]],
+    params: Mapping[str, object],
+    best: Synchronized[int],
+    *,
+    stop_on_first_trigger: bool,
+    set_default_arg: bool,
+    default_arg: object,
+) -> tuple[list[_Evaluated], _Failed | None]:
+    names = build_names((rule for _, rule in rules), params, set_default_arg=set_default_arg, default_arg=default_arg)
+    evaluated: list[_Evaluated] = []
+    best_unlocked = best.get_obj()  # reading does not need the lock, only the update does
+    for index, rule in rules:
+        if stop_on_first_trigger and best_unlocked.value < index:
+            break  # a rule earlier in the global order has already triggered
+        try:
+            action_result: list[object] = []
+            if stop_on_first_trigger:
+                condition_result = rule._check(names)  # noqa: SLF001
+            else:
+                condition_result, action_result = rule._run(names)  # noqa: SLF001
+        except Exception as e:  # noqa: BLE001 - passed back and re-raised by the caller
+            return evaluated, _Failed(index, _transferable(e))
+        evaluated.append(_Evaluated(index, condition_result, action_result))
+        if stop_on_first_trigger and condition_result:
+            with best.get_lock():
+                best.value = min(best.value, index)
+            break
+    return evaluated, None
+
+
+def _shard_main(connection: Connection, rules: Sequence[tuple[int, Rule]], best: Synchronized[int]) -> None:
+    """Serve requests for one shard until the connection is closed."""
+    by_index = dict(rules)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        command, payload, options = request
+        if command == "evaluate":
+            connection.send(_evaluate_shard(rules, payload, best, **options))
+            continue
+        rule = by_index[payload["index"]]
+        try:
+            connection.send(rule.run_action(build_names([rule], payload["params"], **options)))
+        except Exception as e:  # noqa: BLE001 - passed back and re-raised by the caller
+            connection.send(_Failed(payload["index"], _transferable(e)))
+
+
+def _partition(rules: Sequence[Rule], shards: int, partition: Partition) -> list[list[tuple[int, Rule]]]:
+    parts: list[list[tuple[int, Rule]]] = [[] for _ in range(shards)]
+    for index, rule in enumerate(rules):
+        shard = zlib.crc32(rule.rulename.encode()) % shards if partition == "hash" else index * shards // len(rules)
+        parts[shard].append((index, rule))
+    return parts
+
+
+class ShardedRuleSet:
+    """Rule set partitioned across worker processes; create it with :meth:`RuleParser.shard`.
+
+    The shards are a snapshot of the enabled rules.  Requests are executed one at a
+    time; call :meth:`close` (or use the object as a context manager) to stop the workers.
+    """
+
+    def __init__(self, rules: Sequence[Rule], *, shards: int, partition: Partition = "priority") -> None:
+        """Start one worker process per shard.
+
+        With the ``fork`` start method (the default on Linux), the rules and registered
+        functions are inherited by the workers; with other start methods they must be picklable.
+
+        :param rules: Enabled rules in evaluation order.
+        :param shards: Number of worker processes.
+        :param partition: ``"priority"`` assigns contiguous priority bands to the shards;
+            ``"hash"`` spreads the rules by a hash of their names.
+        :raises ValueError: If *shards* is less than 1 or *partition* is unknown.
+        """
+        if shards < 1:
+            msg = "shards must be at least 1"
+            raise ValueError(msg)
+        if partition not in ("priority", "hash"):
+            msg = f"unknown partition {partition!r}, expected 'priority' or 'hash'"
+            raise ValueError(msg)
+        self._names = [rule.rulename for rule in rules]
+        self._lock = threading.Lock()
+        context = multiprocessing.get_context()
+        self._best: Synchronized[int] = context.Value("q", _NO_TRIGGER)
+        self._connections: list[Connection] = []
+        self._processes: list[BaseProcess] = []
+        self._shard_of: dict[int, int] = {}
+        for shard, part in enumerate(_partition(rules, shards, partition)):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_shard_main, args=(child_end, part, self._best), daemon=True)
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+            self._shard_of.update((index, shard) for index, _ in part)
+
+    def __enter__(self) -> Self:
+        """Return the rule set."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the worker processes."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of rules."""
+        return len(self._names)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for connection in self._connections:
+            with contextlib.suppress(OSError):
+                connection.send(None)
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections.clear()
+        self._processes.clear()
+
+    def _receive(self, connection: Connection) -> object:
+        try:
+            return connection.recv()
+        except (EOFError, OSError) as e:
+            msg = "shard worker terminated"
+            raise ShardError(msg) from e
+
+    def execute(
+        self,
+        params: Mapping[str, object],
+        *,
+        stop_on_first_trigger: bool = True,
+        set_default_arg: bool = False,
+        default_arg: object = None,
+    ) -> ExecutionResult:
+        """Evaluate the rules of all shards in parallel and merge the results in priority order.
+
+        The triggered rules, results and raised errors are the same as with
+        :meth:`RuleParser.execute <business_rule_engine.RuleParser.execute>`, except that
+        with ``stop_on_first_trigger=False`` the actions of rules after a failing rule may
+        already have run in other shards.  Action results must be picklable.
+
+        :param params: Named values available to all rule expressions; must be picklable.
+        :param stop_on_first_trigger: Stop after the first rule whose condition is satisfied.
+        :param set_default_arg: Substitute *default_arg* for missing keys instead of raising.
+        :param default_arg: Value used for missing keys when *set_default_arg* is ``True``.
+        :returns: :class:`~business_rule_engine.ExecutionResult` containing per-rule results.
+        :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
+        :raises ConditionReturnValueError: If a condition does not return a boolean value.
+        :raises ShardError: If a worker process failed.
+        """
+        names_options = {"set_default_arg": set_default_arg, "default_arg": default_arg}
+        options = {"stop_on_first_trigger": stop_on_first_trigger, **names_options}
+        with self._lock:
+            self._best.value = _NO_TRIGGER
+            for connection in self._connections:
+                connection.send(("evaluate", params, options))
+            evaluated: list[_Evaluated] = []
+            failures: list[_Failed] = []
+            for connection in self._connections:
+                shard_evaluated, failure = cast("tuple[list[_Evaluated], _Failed | None]", self._receive(connection))
+                evaluated.extend(shard_evaluated)
+                if failure is not None:
+                    failures.append(failure)
+
+            error_index = min((f.position for f in failures), default=_NO_TRIGGER)
+            results: list[RuleResult] = []
+            winner: _Evaluated | None = None
+            for entry in sorted(evaluated):
+                if entry.position > error_index:
+                    break
+                results.append(RuleResult(
+                    rule_name=self._names[entry.position],
+                    triggered=entry.condition_result,
+                    condition_result=entry.condition_result,
+                    action_result=entry.action_result,
+                ))
+                if stop_on_first_trigger and entry.condition_result:
+                    winner = entry
+                    break
+            if winner is None and failures:
+                raise min(failures).error
+
+            if winner is not None:
+                connection = self._connections[self._shard_of[winner.position]]
+                connection.send(("actions", {"index": winner.position, "params": params}, names_options))
+                action_result = self._receive(connection)
+                if isinstance(action_result, _Failed):
+                    raise action_result.error
+                results[-1].action_result = cast("list[object]", action_result)
+        return ExecutionResult(results)
@@ -0,0 +1,261 @@
+"""Immutable snapshots of a rule set for concurrent execution."""
+
+from __future__ import annotations
+
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from simpleeval import EvalWithCompoundTypes
+
+from business_rule_engine.bands import band_plan, execute_bands
+from business_rule_engine.decision_tree import DecisionTree
+from business_rule_engine.execution import execute_rules
+from business_rule_engine.expressions import ExpressionCache
+from business_rule_engine.matching import MatchMatrix, match_plan, match_rules
+from business_rule_engine.rule import Rule
+
+if TYPE_CHECKING:
+    import ast
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+
+    from business_rule_engine.bands import TermMemo
+    from business_rule_engine.paths import Names
+    from business_rule_engine.results import ExecutionResult, RuleTrace
+
+
+class _FrozenRule(Rule):
+    """Rule of a :class:`FrozenRuleSet`; only the per-call :attr:`status` can change.
+
+    The rule set's own evaluation never writes :attr:`status`, so the rules of a snapshot
+    are not modified by requests; only direct calls such as :meth:`check_condition` set it.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Reject changes to the rule definition."""
+        if name != "status":
+            msg = f"rule {self.rulename!r} belongs to a frozen rule set"
+            raise AttributeError(msg)
+        super().__setattr__(name, value)
+
+    def _execute(
+        self,
+        names: Names,
+        *,
+        deadline: float | None = None,
+        terms: TermMemo | None = None,
+    ) -> tuple[bool, list[object]]:
+        # Shared by all threads and pre-forked workers: do not write to the rule on the hot path.
+        return self._run(names, deadline=deadline, terms=terms)
+
+    def _explain(self, names: Names, *, deadline: float | None = None) -> RuleTrace:
+        return self._trace(names, deadline=deadline)
+
+    def compile(self, transform: Callable[[ast.AST], ast.AST] | None = None) -> None:
+        """Do nothing: the expressions of a frozen rule are parsed when the rule set is frozen.
+
+        :raises AttributeError: If a *transform* is given.
+        """
+        if transform is not None:
+            msg = f"rule {self.rulename!r} belongs to a frozen rule set"
+            raise AttributeError(msg)
+
+
+def _freeze_rule(rule: Rule, functions: dict[str, Callable[..., object]], expressions: ExpressionCache) -> _FrozenRule:
+    frozen = object.__new__(_FrozenRule)
+    values = {name: getattr(rule, name) for name in Rule.__slots__}
+    values.update(
+        _functions=functions,
+        _expressions=expressions,
+        conditions=tuple(rule.conditions),
+        actions=tuple(rule.actions),
+        status=None,
+    )
+    for name, value in values.items():
+        object.__setattr__(frozen, name, value)
+    return frozen
+
+
+class FrozenRuleSet:
+    """Immutable, fully prepared snapshot of the rules of a :class:`~business_rule_engine.RuleParser`.
+
+    Create it with :meth:`~business_rule_engine.RuleParser.freeze`.  All expressions are
+    parsed, the evaluation order is fixed and the registered functions are copied, so
+    later changes to the parser, its rules or :attr:`RuleParser.CUSTOM_FUNCTIONS
+    <business_rule_engine.RuleParser.CUSTOM_FUNCTIONS>` do not affect the snapshot.
+    Any number of threads can call :meth:`execute` at the same time without locking.
+    """
+
+    __slots__ = ("_band_plan", "_expressions", "_functions", "_match_plan", "_order", "_rules", "_version")
+
+    def __init__(
+        self,
+        rules: Iterable[Rule],
+        functions: Mapping[str, Callable[..., object]],
+        *,
+        version: int = 0,
+    ) -> None:
+        """Freeze copies of *rules*, bound to a copy of *functions*.
+
+        :param rules: Rules to freeze; the originals are not modified.
+        :param functions: Callables available inside rule expressions.
+        :param version: Version of the rule set, see :attr:`RuleParser.version
+            <business_rule_engine.RuleParser.version>`.
+        :raises SyntaxError: If an expression is not valid Python syntax.
+        """
+        self._version = version
+        function_table = dict(functions)
+        # The evaluator adds its compound type constructors to the function table it is
+        # given; add them now so that evaluation never writes to the table.
+        EvalWithCompoundTypes(functions=function_table)
+        self._functions = function_table
+        self._expressions = ExpressionCache()
+        frozen: dict[str, _FrozenRule] = {}
+        for rule in rules:
+            for expression in (rule.condition, *rule.actions):
+                if expression.strip():
+                    self._expressions.add(expression, rule._expressions.get(expression))  # noqa: SLF001
+            frozen[rule.rulename] = _freeze_rule(rule, function_table, self._expressions)
+        self._rules = MappingProxyType(frozen)
+        self._order = tuple(
+            rule for rule in sorted(frozen.values(), key=lambda r: r.priority, reverse=True) if rule.enabled
+        )
+        self._match_plan = tuple(match_plan(frozen.values()))
+        self._band_plan = band_plan(self._order)
+
+    @property
+    def rules(self) -> Mapping[str, Rule]:
+        """Read-only mapping of rule names to the frozen rules, including disabled rules."""
+        return self._rules
+
+    @property
+    def version(self) -> int:
+        """Version of the parser's rule set at freeze time; identifies the bit order of :meth:`match`."""
+        return self._version
+
+    @property
+    def functions(self) -> Mapping[str, Callable[..., object]]:
+        """Read-only view of the functions bound at freeze time."""
+        return MappingProxyType(self._functions)
+
+    def __len__(self) -> int:
+        """Return the number of rules."""
+        return len(self._rules)
+
+    def __contains__(self, rulename: object) -> bool:
+        """Return ``True`` if a rule with the given name is part of the snapshot."""
+        return rulename in self._rules
+
+    def __iter__(self) -> Iterator[Rule]:
+        """Iterate over the rules in insertion order."""
+        return iter(self._rules.values())
+
+    def build_decision_tree(self, *, max_leaf_size: int = 4, max_depth: int = 32) -> DecisionTree:
+        """Compile the enabled rules into a :class:`~business_rule_engine.DecisionTree`.
+
+        See :meth:`RuleParser.build_decision_tree <business_rule_engine.RuleParser.build_decision_tree>`.
+        """
+        return DecisionTree(self._order, max_leaf_size=max_leaf_size, max_depth=max_depth)
+
+    def match(self, params: Mapping[str, object], *, set_default_arg: bool = False, default_arg: object = None) -> int:
+        """Evaluate the conditions of the enabled rules without running any action.
+
+        See :meth:`RuleParser.match <business_rule_engine.RuleParser.match>`; bit ``i``
+        stands for the ``i``-th rule of :attr:`rules`.
+        """
+        return match_rules(self._match_plan, params, set_default_arg=set_default_arg, default_arg=default_arg)
+
+    def match_batch(
+        self,
+        records: Iterable[Mapping[str, object]],
+        *,
+        set_default_arg: bool = False,
+        default_arg: object = None,
+    ) -> MatchMatrix:
+        """Run :meth:`match` for every record and collect the bitsets in a compact 2-D bitmap.
+
+        See :meth:`RuleParser.match_batch <business_rule_engine.RuleParser.match_batch>`.
+        """
+        matrix = MatchMatrix(list(self._rules), self._version)
+        for params in records:
+            matrix.append(match_rules(self._match_plan, params, set_default_arg=set_default_arg, default_arg=default_arg))
+        return matrix
+
+    def execute(
+        self,
+        params: Mapping[str, object],
+        *,
+        stop_on_first_trigger: bool = True,
+        set_default_arg: bool = False,
+        default_arg: object = None,
+        explain: bool = False,
+        budget: float | None = None,
+        stop_on_first_band: bool = False,
+    ) -> ExecutionResult:
+        """Evaluate the enabled rules against the given parameters.
+
+        Takes the same options as :meth:`RuleParser.execute <business_rule_engine.RuleParser.execute>`
+        and returns the same results.
+
+        :param params: Named values available to all rule expressions.
+        :returns: :class:`~business_rule_engine.ExecutionResult` containing per-rule results.
+        :raises MissingArgumentError: If a referenced name is absent and *set_default_arg* is ``False``.
+        :raises ConditionReturnValueError: If a condition does not return a boolean value.
+        """
+        if stop_on_first_band:
+            return execute_bands(
+                self._band_plan,
+                params,
+                set_default_arg=set_default_arg,
+                default_arg=default_arg,
+                explain=explain,
+                budget=budget,
+            )
+        return execute_rules(
+            self._order,
+            params,
+            stop_on_first_trigger=stop_on_first_trigger,
+            set_default_arg=set_default_arg,
+            default_arg=default_arg,
+            explain=explain,
+            budget=budget,
+        )
+
+
+class RuleSetHolder:
+    """Holds the current :class:`FrozenRuleSet` and replaces it atomically.
+
+    Readers fetch :attr:`current` once per request and execute against it; a rule set
+    swapped in meanwhile is only seen by later requests::
+
+        holder = RuleSetHolder(parser.freeze())
+        result = holder.current.execute(params)   # request threads
+        holder.swap(updated_parser.freeze())      # updater thread
+    """
+
+    __slots__ = ("_current", "_lock")
+
+    def __init__(self, rule_set: FrozenRuleSet) -> None:
+        """Initialize the holder.
+
+        :param rule_set: Initial rule set.
+        """
+        self._current = rule_set
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> FrozenRuleSet:
+        """The rule set new requests should execute against."""
+        return self._current
+
+    def swap(self, rule_set: FrozenRuleSet) -> FrozenRuleSet:
+        """Replace the current rule set.
+
+        :param rule_set: New rule set.
+        :returns: The previous rule set.
+        """
+        with self._lock:
+            previous, self._current = self._current, rule_set
+        return previous
@@ -0,0 +1,305 @@
+"""Workload capture and replay for performance testing.
+
+Capture the params that reach :meth:`~business_rule_engine.RuleParser.execute` in
+production by attaching a :class:`WorkloadRecorder`::
+
+    parser.recorder = WorkloadRecorder("workload.bin", sample_rate=0.01)
+
+and replay the file against one or two rule sets::
+
+    python -m business_rule_engine.replay_cli workload.bin rules/current.rules --compare rules/next.rules
+
+The capture file starts with a magic header, followed by one record per execution:
+a 4-byte little-endian length and the pickled ``(params, options)`` pair.  Records
+are only appended, so a file can be captured across restarts; a record cut short
+by a crash is ignored on replay.  Replay unpickles the records, so only replay
+files you captured yourself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import mmap
+import pickle
+import random
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, Self
+
+from business_rule_engine.cli import build_parser
+from business_rule_engine.exceptions import RuleParserError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping, Sequence
+    from types import TracebackType
+
+    from business_rule_engine.results import ExecutionResult
+
+MAGIC = b"BRECAP1\n"
+_LENGTH = struct.Struct("<I")
+
+
+class _Executor(Protocol):
+    @property
+    def execute(self) -> Callable[..., ExecutionResult]:
+        """Execute the rules for one record."""
+
+
+class WorkloadRecorder:
+    """Append sampled executions to a capture file.
+
+    Attach it to a parser with ``parser.recorder = recorder``; the parser then
+    records the params and options of every sampled :meth:`~business_rule_engine.RuleParser.execute`
+    call.  Recording is thread-safe.  Params that cannot be pickled are skipped.
+    """
+
+    def __init__(self, path: str | Path, *, sample_rate: float = 1.0, seed: int | None = None) -> None:
+        """Open *path* for appending, writing the header if the file is new.
+
+        :param path: Capture file.
+        :param sample_rate: Fraction of executions to record, between 0 and 1.
+        :param seed: Seed for the sampling decisions, for reproducible captures.
+        :raises ValueError: If *sample_rate* is not between 0 and 1, or the file is not a capture file.
+        """
+        if not 0 <= sample_rate <= 1:
+            msg = "sample_rate must be between 0 and 1"
+            raise ValueError(msg)
+        self.sample_rate = sample_rate
+        self.recorded = 0
+        """Number of recorded executions."""
+        self.skipped = 0
+        """Number of sampled executions whose params could not be pickled."""
+        self._random = random.Random(seed)  # noqa: S311 - sampling, not cryptography
+        self._lock = threading.Lock()
+        self._file = Path(path).open("ab")  # noqa: SIM115 - closed by close()
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            return
+        with Path(path).open("rb") as existing:
+            header = existing.read(len(MAGIC))
+        if header != MAGIC:
+            self._file.close()
+            msg = f"{path} is not a workload capture file"
+            raise ValueError(msg)
+
+    def record(self, params: Mapping[str, object], options: Mapping[str, object]) -> None:
+        """Record one execution if it is sampled.
+
+        :param params: Params passed to ``execute()``.
+        :param options: Keyword options passed to ``execute()``.
+        """
+        with self._lock:
+            if self._file.closed or (self.sample_rate < 1 and self._random.random() >= self.sample_rate):
+                return
+            try:
+                payload = pickle.dumps((dict(params), dict(options)), pickle.HIGHEST_PROTOCOL)
+            except Exception:  # noqa: BLE001 - capturing must never break execution
+                self.skipped += 1
+                return
+            self._file.write(_LENGTH.pack(len(payload)) + payload)
+            self.recorded += 1
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the capture file; later executions are no longer recorded."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> Self:
+        """Return the recorder."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the capture file."""
+        self.close()
+
+
+def read_workload(path: str | Path) -> Iterator[tuple[dict[str, object], dict[str, object]]]:
+    """Iterate over the ``(params, options)`` records of a capture file via a memory map.
+
+    :param path: Capture file.
+    :raises ValueError: If the file is not a capture file.
+    """
+    with Path(path).open("rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            msg = f"{path} is not a workload capture file"
+            raise ValueError(msg)
+        if f.seek(0, 2) == len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = len(MAGIC)
+            while offset + _LENGTH.size <= len(data):
+                (size,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                if offset + size > len(data):
+                    return  # incomplete last record
+                yield pickle.loads(data[offset:offset + size])  # noqa: S301 - capture files are trusted input
+                offset += size
+
+
+@dataclass
+class ReplayStats:
+    """Throughput and latency of one rule set during a replay.
+
+    :param records: Number of replayed records.
+    :param errors: Number of records whose execution raised an exception.
+    :param latencies: Execution time of every record in seconds, sorted.
+    """
+
+    records: int = 0
+    errors: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        """Total execution time in seconds."""
+        return math.fsum(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Records per second of execution time."""
+        seconds = self.seconds
+        return self.records / seconds if seconds else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Return the latency in seconds below which *percent* of the records completed (nearest rank)."""
+        if not self.latencies:
+            return 0.0
+        rank = max(math.ceil(percent / 100 * len(self.latencies)), 1)
+        return self.latencies[min(rank, len(self.latencies)) - 1]
+
+
+@dataclass
+class ReplayDiff:
+    """A record for which the two replayed rule sets produced different outcomes.
+
+    An outcome is the list of ``(rule_name, action_result)`` pairs of the triggered
+    rules, or the ``"ExceptionType: message"`` of a raised exception.
+
+    :param record: Index of the record in the capture file.
+    :param baseline: Outcome of the baseline rule set.
+    :param candidate: Outcome of the candidate rule set.
+    """
+
+    record: int
+    baseline: object
+    candidate: object
+
+
+@dataclass
+class ReplayReport:
+    """Result of :func:`replay`.
+
+    :param baseline: Statistics of the baseline rule set.
+    :param candidate: Statistics of the candidate rule set, if one was given.
+    :param diffs: Records with different outcomes, if a candidate was given.
+    """
+
+    baseline: ReplayStats
+    candidate: ReplayStats | None = None
+    diffs: list[ReplayDiff] = field(default_factory=list)
+
+
+def _run(executor: _Executor, params: Mapping[str, object], options: Mapping[str, object], stats: ReplayStats) -> object:
+    """Execute one record, add its latency to *stats* and return its outcome."""
+    start = time.perf_counter()
+    try:
+        result = executor.execute(params, **options)
+    except Exception as e:  # noqa: BLE001 - errors are part of the replayed outcome
+        stats.latencies.append(time.perf_counter() - start)
+        stats.errors += 1
+        return f"{type(e).__name__}: {e}"
+    stats.latencies.append(time.perf_counter() - start)
+    return [(r.rule_name, r.action_result) for r in result.results if r.triggered]
+
+
+def replay(path: str | Path, baseline: _Executor, candidate: _Executor | None = None) -> ReplayReport:
+    """Feed the records of a capture file through *baseline* (and *candidate*).
+
+    :param path: Capture file written by :class:`WorkloadRecorder`.
+    :param baseline: A :class:`~business_rule_engine.RuleParser` or
+        :class:`~business_rule_engine.FrozenRuleSet`.
+    :param candidate: Optional second rule set whose outcomes are compared to *baseline*.
+    :returns: Throughput, latencies and outcome differences.
+    """
+    report = ReplayReport(ReplayStats(), ReplayStats() if candidate is not None else None)
+    for record, (params, options) in enumerate(read_workload(path)):
+        expected = _run(baseline, params, options, report.baseline)
+        report.baseline.records += 1
+        if candidate is not None and report.candidate is not None:
+            actual = _run(candidate, params, options, report.candidate)
+            report.candidate.records += 1
+            if actual != expected:
+                report.diffs.append(ReplayDiff(record, expected, actual))
+    report.baseline.latencies.sort()
+    if report.candidate is not None:
+        report.candidate.latencies.sort()
+    return report
+
+
+def _format_stats(label: str, stats: ReplayStats) -> str:
+    percentiles = ", ".join(f"p{p:g} {stats.percentile(p) * 1e6:.1f}us" for p in (50, 90, 99, 99.9))
+    return (
+        f"{label}: {stats.records} records in {stats.seconds:.3f}s ({stats.throughput:.0f} records/s), "
+        f"{stats.errors} errors, {percentiles}\n"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Replay a capture file from the command line.
+
+    :param argv: Command-line arguments; defaults to ``sys.argv[1:]``.
+    :returns: Process exit code: 0, or 1 on load errors or if the outcomes differ.
+    """
+    argparser = argparse.ArgumentParser(
+        prog="python -m business_rule_engine.replay_cli",
+        description="Replay a workload capture file and report throughput, latency and result differences.",
+    )
+    argparser.add_argument("capture", help="capture file written by WorkloadRecorder")
+    argparser.add_argument("rule_files", nargs="+", metavar="RULEFILE", help="baseline rule file(s)")
+    argparser.add_argument(
+        "--compare",
+        action="append",
+        default=[],
+        metavar="RULEFILE",
+        help="candidate rule file(s) whose results are compared with the baseline (may be repeated)",
+    )
+    argparser.add_argument(
+        "-f",
+        "--functions",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="import MODULE and register its public functions (may be repeated)",
+    )
+    args = argparser.parse_args(argv)
+
+    try:
+        baseline = build_parser(args.rule_files, args.functions)
+        candidate = build_parser(args.compare, []) if args.compare else None
+        report = replay(args.capture, baseline, candidate)
+    except (OSError, ValueError, ImportError, RuleParserError) as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 1
+
+    sys.stdout.write(_format_stats("baseline", report.baseline))
+    if report.candidate is not None:
+        sys.stdout.write(_format_stats("candidate", report.candidate))
+        sys.stdout.write(f"{len(report.diffs)} records with different results\n")
+        for diff in report.diffs[:20]:
+            sys.stdout.write(f"  record {diff.record}: {diff.baseline!r} != {diff.candidate!r}\n")
+    return 1 if report.diffs else 0
@@ -0,0 +1,128 @@
+import pytest
+
+from business_rule_engine import RuleParser
+
+RULES = """
+rule "gold" priority 10
+when
+    total > 1000
+then
+    label("gold")
+end
+
+rule "gold and big" priority 10
+when
+    total > 1000 and items > 10
+then
+    label("big")
+end
+
+rule "silver" priority 5
+when
+    total > 100
+then
+    label("silver")
+end
+
+rule "any" priority 0
+when
+    total >= 0
+then
+    label("any")
+end
+"""
+
+
+class CountingValue:
+    def __init__(self, value):
+        self.value = value
+        self.additions = 0
+
+    def __add__(self, other):
+        self.additions += 1
+        return self.value + other
+
+
+@pytest.fixture
+def parser():
+    RuleParser.register_function(lambda name: name, "label")
+    parser = RuleParser()
+    parser.parsestr(RULES)
+    return parser
+
+
+def triggered(result):
+    return [r.rule_name for r in result.results if r.triggered]
+
+
+@pytest.mark.parametrize(("total", "expected"), [
+    (5000, ["gold", "gold and big"]),
+    (500, ["silver"]),
+    (5, ["any"]),
+])
+def test_first_band_with_match_fires(parser, total, expected):
+    result = parser.execute({"total": total, "items": 20}, stop_on_first_band=True)
+    assert triggered(result) == expected
+    assert {r.rule_name for r in result.results} >= set(expected)
+
+
+def test_lower_bands_are_not_evaluated(parser):
+    result = parser.execute({"total": 5000, "items": 1}, stop_on_first_band=True, stop_on_first_trigger=True)
+    assert [r.rule_name for r in result.results] == ["gold", "gold and big"]
+    assert triggered(result) == ["gold"]
+    assert result.results[0].action_result == ["gold"]
+
+
+def test_frozen_rule_set_matches_parser(parser):
+    frozen = parser.freeze()
+    for total in (5000, 500, 5):
+        params = {"total": total, "items": 20}
+        expected = parser.execute(params, stop_on_first_band=True)
+        assert frozen.execute(params, stop_on_first_band=True).results == expected.results
+
+
+def test_band_plan_follows_priority_changes(parser):
+    params = {"total": 5000, "items": 20}
+    assert triggered(parser.execute(params, stop_on_first_band=True)) == ["gold", "gold and big"]
+    parser.rules["gold and big"].priority = 1
+    assert triggered(parser.execute(params, stop_on_first_band=True)) == ["gold"]
+
+
+def test_shared_terms_are_evaluated_once():
+    parser = RuleParser()
+    parser.add_rule("a", "amount + 1 > 100 and flag", "1", priority=2)
+    parser.add_rule("b", "amount + 1 > 100", "2", priority=2)
+    parser.add_rule("c", "not flag or amount + 1 > 100", "3", priority=1)
+    amount = CountingValue(5)
+    result = parser.execute({"amount": amount, "flag": True}, stop_on_first_band=True)
+    assert not result
+    assert amount.additions == 1
+
+
+def test_function_call_discards_shared_terms():
+    RuleParser.register_function(lambda: False, "touch")
+    parser = RuleParser()
+    parser.add_rule("a", "amount + 1 > 100 or touch()", "1")
+    parser.add_rule("b", "amount + 1 > 100", "2")
+    amount = CountingValue(5)
+    parser.execute({"amount": amount}, stop_on_first_band=True)
+    assert amount.additions == 2
+
+
+def test_terms_inside_comprehensions_are_not_shared():
+    parser = RuleParser()
+    parser.add_rule("a", "x + 1 > 2", "'top level'", priority=1)
+    parser.add_rule("b", "[x for x in values if x + 1 > 2] == [5]", "'comprehension'", priority=1)
+    result = parser.execute({"x": 0, "values": [0, 5]}, stop_on_first_band=True)
+    assert triggered(result) == ["b"]
+
+
+def test_budget_and_explain(parser):
+    result = parser.execute({"total": 500, "items": 1}, stop_on_first_band=True, explain=True, budget=60)
+    assert triggered(result) == ["silver"]
+    assert [t.rule_name for t in result.trace] == ["gold", "gold and big", "silver"]
+    assert not result.truncated
+
+    result = parser.execute({"total": 500, "items": 1}, stop_on_first_band=True, budget=0)
+    assert result.truncated
+    assert result.not_evaluated == ["gold", "gold and big", "silver", "any"]
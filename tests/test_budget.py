@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from business_rule_engine import RuleParser
+
+
+def slow(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def parser():
+    RuleParser.register_function(slow)
+    parser = RuleParser()
+    parser.add_rule("first", "x > 0", "slow(0.05)", priority=3)
+    parser.add_rule("second", "x > 0", "slow(0)", priority=2)
+    parser.add_rule("third", "x > 0", "slow(0)", priority=1)
+    return parser
+
+
+def test_without_budget_nothing_is_truncated(parser):
+    result = parser.execute({"x": 1}, stop_on_first_trigger=False)
+    assert not result.truncated
+    assert result.not_evaluated == []
+    assert len(result.results) == 3
+
+
+def test_budget_exhausted_returns_partial_result(parser):
+    result = parser.execute({"x": 1}, stop_on_first_trigger=False, budget=0.01)
+    assert result.truncated
+    assert [r.rule_name for r in result.results] == ["first"]
+    assert result.results[0].action_result == [0.05]
+    assert result.not_evaluated == ["second", "third"]
+
+
+def test_budget_is_checked_between_actions():
+    RuleParser.register_function(slow)
+    parser = RuleParser()
+    parser.parsestr('rule "r"\nwhen\n    True\nthen\n    slow(0.05)\n    slow(0)\nend\n')
+    result = parser.execute({}, budget=0.01)
+    assert result.truncated
+    assert result.results[0].triggered
+    assert result.results[0].action_result == [0.05]
+
+
+def test_expensive_rules_are_skipped(parser):
+    parser.rules["first"].cost = 10
+    result = parser.execute({"x": 1}, budget=1)
+    assert result.truncated
+    assert result.not_evaluated == ["first"]
+    assert [r.rule_name for r in result.results] == ["second"]
+
+
+def test_cost_in_dsl():
+    parser = RuleParser()
+    parser.parsestr('rule "r"\ncost 0.5\nwhen\n    True\nthen\n    1\nend\n')
+    assert parser.rules["r"].cost == 0.5
+    assert parser.execute({}, budget=0.1).not_evaluated == ["r"]
+    assert parser.execute({}).results[0].triggered
+
+
+def test_add_rule_cost():
+    parser = RuleParser()
+    parser.add_rule("r", "True", "1", cost=2)
+    assert parser.rules["r"].cost == 2
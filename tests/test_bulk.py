@@ -0,0 +1,82 @@
+import pytest
+
+from business_rule_engine import BulkFunctionError, MissingArgumentError, RuleParser
+
+RULES = """
+rule "reorder"
+when
+    stock < 20
+then
+    order_more(50 - stock, sku)
+    log_order(sku)
+end
+"""
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def parser(calls):
+    def order_more(batch):
+        calls.append(list(batch))
+        return [f"{sku}: {amount}" for amount, sku in batch]
+
+    RuleParser.register_function(order_more, bulk=True)
+    RuleParser.register_function(lambda sku: f"logged {sku}", "log_order")
+    parser = RuleParser()
+    parser.parsestr(RULES)
+    return parser
+
+
+def records(count):
+    return [{"stock": i, "sku": f"sku{i}"} for i in range(count)]
+
+
+def test_calls_are_coalesced(parser, calls):
+    results = parser.execute_batch(records(30))
+
+    assert calls == [[(50 - i, f"sku{i}") for i in range(20)]]
+    assert results[3].results[0].action_result == ["sku3: 47", "logged sku3"]
+    assert not results[25]
+
+
+def test_max_pending_flushes_early(parser, calls):
+    results = parser.execute_batch(records(20), max_pending=8)
+    assert [len(batch) for batch in calls] == [8, 8, 4]
+    assert [r.results[0].action_result[0] for r in results] == [f"sku{i}: {50 - i}" for i in range(20)]
+
+
+def test_max_delay_flushes_early(parser, calls):
+    parser.execute_batch(records(3), max_delay=0)
+    assert [len(batch) for batch in calls] == [1, 1, 1]
+
+
+def test_bulk_function_outside_batch(parser, calls):
+    result = parser.execute({"stock": 1, "sku": "a"})
+    assert result.results[0].action_result == ["a: 49", "logged a"]
+    assert calls == [[(49, "a")]]
+
+
+def test_nested_bulk_call_runs_immediately(calls):
+    RuleParser.register_function(lambda batch: [sum(args) for args in batch], "total", bulk=True)
+    parser = RuleParser()
+    parser.add_rule("r", "True", "[total(x, 1)]")
+    results = parser.execute_batch([{"x": 1}, {"x": 2}])
+    assert [r.results[0].action_result for r in results] == [[[2]], [[3]]]
+
+
+def test_wrong_number_of_results():
+    RuleParser.register_function(lambda batch: [], "broken", bulk=True)
+    parser = RuleParser()
+    parser.add_rule("r", "True", "broken(1)")
+    with pytest.raises(BulkFunctionError):
+        parser.execute_batch([{}])
+
+
+def test_error_discards_pending_calls(parser, calls):
+    with pytest.raises(MissingArgumentError):
+        parser.execute_batch([{"stock": 1, "sku": "a"}, {}])
+    assert calls == []
@@ -0,0 +1,145 @@
+import json
+import sys
+import textwrap
+
+import pytest
+
+from business_rule_engine.cli import main
+
+
+@pytest.fixture
+def functions_module(tmp_path, monkeypatch):
+    module = tmp_path / "cli_rule_functions.py"
+    module.write_text(textwrap.dedent("""
+        def order_more(items_to_order):
+            return "you ordered {} new items".format(items_to_order)
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "cli_rule_functions"
+    sys.modules.pop("cli_rule_functions", None)
+
+
+def read_output(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_cli_jsonl(rules_dir, functions_module, tmp_path, capsys):
+    source = tmp_path / "stock.jsonl"
+    source.write_text('{"products_in_stock": 10}\n\n{"products_in_stock": 100}\n')
+    output = tmp_path / "out.jsonl"
+
+    exit_code = main([
+        str(rules_dir / "order_items.rule"),
+        "--functions", functions_module,
+        "--input", str(source),
+        "--output", str(output),
+    ])
+
+    assert exit_code == 0
+    assert read_output(output) == [
+        {"record": 0, "triggered": ["order new items"],
+         "action_results": {"order new items": ["you ordered 50 new items"]}},
+        {"record": 1, "triggered": [], "action_results": {}},
+    ]
+    assert "scored 2 records" in capsys.readouterr().err
+
+
+def test_cli_csv(rules_dir, functions_module, tmp_path):
+    source = tmp_path / "stock.csv"
+    source.write_text("products_in_stock\n10\n30\n")
+    output = tmp_path / "out.jsonl"
+
+    main([
+        str(rules_dir / "order_items.rule"),
+        "-f", functions_module,
+        "-i", str(source),
+        "-o", str(output),
+        "--quiet",
+    ])
+
+    assert [r["triggered"] for r in read_output(output)] == [["order new items"], []]
+
+
+def test_cli_csv_rows_with_wrong_field_count(rules_dir, functions_module, tmp_path):
+    source = tmp_path / "stock.csv"
+    source.write_text("products_in_stock,other\n10,1\n30\n5,1,9\n100,1\n")
+    output = tmp_path / "out.jsonl"
+
+    main([str(rules_dir / "order_items.rule"), "-f", functions_module, "-i", str(source), "-o", str(output), "-q"])
+
+    records = read_output(output)
+    assert [r["record"] for r in records] == [0, 1, 2, 3]
+    assert records[0]["triggered"] == ["order new items"]
+    assert "does not have 2 fields" in records[1]["error"]
+    assert "does not have 2 fields" in records[2]["error"]
+    assert records[3]["triggered"] == []
+
+
+def test_cli_stdin_stdout(rules_dir, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", __import__("io").StringIO('{"x": 5}\n'))
+    main([str(rules_dir / "stop_on_trigger.rule"), "--all-rules", "-q"])
+    record = json.loads(capsys.readouterr().out)
+    assert record["triggered"] == ["rule A", "rule B"]
+
+
+def test_cli_missing_argument_is_reported_per_record(rules_dir, functions_module, tmp_path):
+    source = tmp_path / "stock.jsonl"
+    source.write_text('{"produtcs_in_stock": 10}\n')
+    output = tmp_path / "out.jsonl"
+
+    main([str(rules_dir / "order_items.rule"), "-f", functions_module, "-i", str(source), "-o", str(output), "-q"])
+
+    assert "error" in read_output(output)[0]
+
+
+def test_cli_default_arg(rules_dir, functions_module, tmp_path):
+    source = tmp_path / "stock.jsonl"
+    source.write_text('{}\n')
+    output = tmp_path / "out.jsonl"
+
+    main([
+        str(rules_dir / "order_items.rule"), "-f", functions_module,
+        "-i", str(source), "-o", str(output), "--default-arg", "0", "-q",
+    ])
+
+    assert read_output(output)[0]["triggered"] == ["order new items"]
+
+
+def test_cli_workers(rules_dir, functions_module, tmp_path):
+    source = tmp_path / "stock.jsonl"
+    source.write_text("".join(json.dumps({"products_in_stock": i}) + "\n" for i in range(50)))
+    output = tmp_path / "out.jsonl"
+
+    main([
+        str(rules_dir / "order_items.rule"), "-f", functions_module,
+        "-i", str(source), "-o", str(output), "--workers", "2", "--chunk-size", "7", "-q",
+    ])
+
+    records = read_output(output)
+    assert [r["record"] for r in records] == list(range(50))
+    assert sum(1 for r in records if r["triggered"]) == 20
+
+
+def test_cli_malformed_json_line_is_reported_per_record(rules_dir, functions_module, tmp_path):
+    source = tmp_path / "stock.jsonl"
+    source.write_text('{"products_in_stock": 10}\n{"products_in_stock": \n{"products_in_stock": 100}\n')
+    output = tmp_path / "out.jsonl"
+
+    main([str(rules_dir / "order_items.rule"), "-f", functions_module, "-i", str(source), "-o", str(output)])
+
+    records = read_output(output)
+    assert [r["record"] for r in records] == [0, 1, 2]
+    assert records[0]["triggered"] == ["order new items"]
+    assert records[1]["error"].startswith("JSONDecodeError")
+    assert records[2]["triggered"] == []
+
+
+def test_cli_invalid_default_arg(rules_dir, capsys):
+    with pytest.raises(SystemExit):
+        main([str(rules_dir / "order_items.rule"), "--default-arg", "{oops"])
+    assert "--default-arg" in capsys.readouterr().err
+
+
+def test_cli_missing_rule_file(capsys):
+    assert main(["/nonexistent/path/rules.rule"]) == 1
+    assert "error" in capsys.readouterr().err
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from business_rule_engine import RuleParser
+from business_rule_engine.exceptions import MissingArgumentError
+
+
+def first_triggered(result):
+    triggered = [r.rule_name for r in result.results if r.triggered]
+    return triggered[0] if triggered else None
+
+
+def random_condition(rng):
+    terms = []
+    if rng.random() < 0.7:
+        terms.append(f"x {rng.choice(['<', '<=', '>', '>=', '=='])} {rng.randint(0, 100)}")
+    if rng.random() < 0.5:
+        terms.append(f"{rng.randint(0, 100)} < y")
+    if rng.random() < 0.5:
+        terms.append(f"color == {rng.choice(['red', 'green', 'blue'])!r}")
+    if rng.random() < 0.3:
+        terms.append(f"size in {tuple(rng.sample(['s', 'm', 'l', 'xl'], 2))!r}")
+    if rng.random() < 0.1:
+        terms.append("(x > 50 or y > 50)")
+    return " and ".join(terms) or "x != y"
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_decision_tree_matches_linear_scan(optimize):
+    rng = random.Random(1234)
+    parser = RuleParser(optimize=optimize)
+    for i in range(300):
+        parser.add_rule(f"rule {i}", random_condition(rng), "True", priority=rng.randint(0, 5))
+    tree = parser.build_decision_tree()
+
+    for _ in range(500):
+        params = {
+            "x": rng.choice([rng.randint(-5, 105), rng.uniform(-5, 105)]),
+            "y": rng.randint(-5, 105),
+            "color": rng.choice(["red", "green", "blue", "black"]),
+            "size": rng.choice(["s", "m", "l", "xl", "xxl"]),
+        }
+        expected = parser.execute(params)
+        actual = tree.execute(params)
+        assert first_triggered(actual) == first_triggered(expected)
+        assert len(actual.results) <= len(expected.results)
+
+
+def test_decision_tree_skips_rules():
+    parser = RuleParser()
+    for i in range(100):
+        parser.add_rule(f"band {i}", f"{i * 10} <= amount and amount < {(i + 1) * 10}", f"{i}")
+    tree = parser.build_decision_tree(max_leaf_size=1)
+    result = tree.execute({"amount": 555})
+    assert len(result.results) == 1
+    assert result.results[0].action_result == [55]
+
+
+def test_decision_tree_fallback_rules():
+    parser = RuleParser()
+    parser.add_rule("call", "abs(x) > 5", "1", priority=5)
+    parser.add_rule("low", "x < 0", "2")
+    parser.add_rule("high", "x >= 0", "3")
+    RuleParser.register_function(abs)
+    tree = parser.build_decision_tree(max_leaf_size=1)
+    assert tree.fallback_rules == ["call"]
+    assert first_triggered(tree.execute({"x": -10})) == "call"
+    assert first_triggered(tree.execute({"x": -1})) == "low"
+    assert first_triggered(tree.execute({"x": 1})) == "high"
+
+
+def test_decision_tree_missing_and_default_args():
+    parser = RuleParser()
+    parser.add_rule("low", "x < 10", "1")
+    parser.add_rule("high", "x >= 10", "2")
+    tree = parser.build_decision_tree(max_leaf_size=1)
+    with pytest.raises(MissingArgumentError):
+        tree.execute({})
+    assert first_triggered(tree.execute({}, set_default_arg=True, default_arg=0)) == "low"
+
+
+def test_decision_tree_uncomparable_value_falls_back():
+    parser = RuleParser()
+    parser.add_rule("str", "x == 'a'", "1", priority=1)
+    parser.add_rule("low", "x < 10", "2")
+    parser.add_rule("high", "x >= 10", "3")
+    tree = parser.build_decision_tree(max_leaf_size=1)
+    assert first_triggered(tree.execute({"x": "a"})) == "str"
+    assert first_triggered(tree.execute({"x": 20})) == "high"
+    with pytest.raises(TypeError):
+        tree.execute({"x": "b"})
+    assert not tree.execute({"x": float("nan")})
+
+
+def test_decision_tree_errors_of_pruned_rules_are_not_raised():
+    parser = RuleParser()
+    parser.add_rule("mixed", "a >= 2 and b == True", "1", priority=1)
+    parser.add_rule("other", "b == 3", "2")
+    tree = parser.build_decision_tree(max_leaf_size=1)
+    params = {"a": "y", "b": 3}
+    with pytest.raises(TypeError):
+        parser.execute(params)
+    assert first_triggered(tree.execute(params)) == "other"
+
+
+def test_decision_tree_ignores_disabled_rules():
+    parser = RuleParser()
+    parser.add_rule("off", "x < 10", "1", enabled=False)
+    parser.add_rule("on", "x < 20", "2")
+    assert first_triggered(parser.build_decision_tree().execute({"x": 5})) == "on"
@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+
+from business_rule_engine import ConditionReturnValueError, MissingArgumentError, RuleParser
+
+RULES = """
+rule "small order"
+when
+    amount < 100 and country == "AT"
+then
+    discount(amount)
+end
+
+rule "any order"
+when
+    amount > 0 or vip
+then
+    discount(0)
+end
+"""
+
+
+@pytest.fixture
+def parser():
+    RuleParser.register_function(lambda amount: amount / 10, "discount")
+    parser = RuleParser()
+    parser.parsestr(RULES)
+    return parser
+
+
+def test_execute_without_explain_records_no_trace(parser):
+    assert parser.execute({"amount": 50, "country": "AT", "vip": False}).trace is None
+
+
+def test_explain_records_params_terms_and_results(parser):
+    result = parser.execute({"amount": 50, "country": "DE", "vip": False, "unused": 1}, explain=True)
+
+    small, any_order = result.trace
+    assert small.rule_name == "small order"
+    assert small.params == {"amount": 50, "country": "DE"}
+    assert [(t.expression, t.value) for t in small.terms] == [("amount < 100", True), ("country == 'AT'", False)]
+    assert small.condition_result is False
+    assert small.action_result == []
+    assert small.condition_seconds >= 0
+    assert small.action_seconds >= 0
+
+    # ``or`` short-circuits on the first true operand, so ``vip`` is not evaluated.
+    assert [(t.expression, t.value) for t in any_order.terms] == [("amount > 0", True)]
+    assert any_order.action_result == [0.0]
+    assert [r.triggered for r in result.results] == [False, True]
+
+
+def test_explain_stops_with_first_trigger(parser):
+    result = parser.execute({"amount": 50, "country": "AT", "vip": False}, stop_on_first_trigger=True, explain=True)
+    assert [t.rule_name for t in result.trace] == ["small order"]
+    assert result.trace[0].action_result == [5.0]
+
+
+def test_explain_with_default_arg(parser):
+    result = parser.execute({}, set_default_arg=True, default_arg=False, explain=True)
+    assert result.trace[0].params == {"amount": False, "country": False}
+    assert result.trace[1].params == {"amount": False, "vip": False}
+
+
+def test_explain_raises_like_execute(parser):
+    with pytest.raises(MissingArgumentError):
+        parser.execute({"amount": 50}, explain=True)
+
+    parser = RuleParser()
+    parser.parsestr('rule "r"\nwhen\n    x + 1\nthen\n    x\nend\n')
+    with pytest.raises(ConditionReturnValueError):
+        parser.execute({"x": 1}, explain=True)
+
+
+def test_debug_logging_is_skipped_when_disabled(parser, caplog):
+    with caplog.at_level(logging.INFO, logger="business_rule_engine"):
+        parser.execute({"amount": 50, "country": "AT", "vip": False})
+    assert not caplog.records
+    with caplog.at_level(logging.DEBUG, logger="business_rule_engine"):
+        parser.execute({"amount": 50, "country": "AT", "vip": False})
+    assert any("small order" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,94 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from business_rule_engine import Rule, RuleParser
+from business_rule_engine.expressions import ExpressionCache
+
+
+def generated_rules(count):
+    return "".join(
+        f'rule "r{i}"\nwhen\n    x > {i % 10}\n    and y < 3\nthen\n    order_more(50)\nend\n'
+        for i in range(count)
+    )
+
+
+def test_identical_expressions_are_parsed_once():
+    parser = RuleParser()
+    parser.parsestr(generated_rules(100))
+    for rule in parser:
+        rule.compile()
+    assert len(parser.expressions) == 11
+    conditions = [rule.parsed_condition() for rule in parser.rules.values()]
+    assert conditions[0] is conditions[10]
+
+
+def test_repeated_sub_expressions_share_nodes():
+    cache = ExpressionCache()
+    first = cache.get("x > 1 and y < 3")
+    second = cache.get("x > 2 and y < 3")
+    third = cache.get("x > 3 and y < 3")
+    assert first.value.values[0].left is second.value.values[0].left
+    assert second.value.values[1] is third.value.values[1]
+    assert second.value.values[0] is not third.value.values[0]
+
+
+def test_sub_expressions_with_distinct_literals_are_not_shared():
+    cache = ExpressionCache()
+    for i in range(100):
+        cache.get(f"amount > {i} and country == 'AT'")
+    assert cache.node_count < 120
+
+
+def test_memory_per_rule_with_distinct_literals():
+    parser = RuleParser()
+    for i in range(2000):
+        parser.add_rule(f"r{i}", f"amount > {i} and country == 'AT' and tier in ['a', 'b', 'c']", "1")
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        parser.execute({"amount": -1, "country": "AT", "tier": "a"}, stop_on_first_trigger=False)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert (after - before) / 2000 < 1750
+
+
+def test_shared_nodes_keep_literal_types():
+    parser = RuleParser()
+    parser.add_rule("int", "True", "(1, 2)")
+    parser.add_rule("float", "True", "(1.0, 2)")
+    parser.add_rule("bool", "True", "(True, 2)")
+    results = parser.execute({}, stop_on_first_trigger=False).results
+    assert [type(r.action_result[0][0]) for r in results] == [int, float, bool]
+
+
+def test_interned_expression_strings():
+    parser = RuleParser()
+    parser.parsestr(generated_rules(20))
+    assert parser.rules["r0"].actions[0] is parser.rules["r1"].actions[0]
+
+
+def test_rule_has_no_instance_dict():
+    rule = Rule("r")
+    with pytest.raises(AttributeError):
+        rule.__dict__  # noqa: B018
+
+
+def test_memory_footprint():
+    parser = RuleParser()
+    empty = parser.memory_footprint()
+    assert empty.rules == 0
+    assert empty.bytes_per_rule == 0.0
+
+    parser.parsestr(generated_rules(1000))
+    footprint = parser.memory_footprint()
+    assert footprint.rules == 1000
+    assert footprint.total_bytes == footprint.rule_bytes + footprint.expression_bytes
+    assert 0 < footprint.bytes_per_rule < 2000
+
+    parser.parsestr(generated_rules(2000).replace('rule "r', 'rule "s'))
+    assert parser.memory_footprint().rules == 3000
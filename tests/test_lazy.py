@@ -0,0 +1,87 @@
+import pytest
+
+from business_rule_engine import RuleParser
+
+RULES = """
+rule "low" priority 1
+when
+    stock < 20
+then
+    order(50)
+end
+
+rule "broken" priority 5
+when
+    stock <
+then
+    order(1)
+end
+
+rule "very low" priority 9
+when
+    True and stock < 5
+then
+    order(200)
+end
+"""
+
+
+@pytest.fixture
+def parser():
+    RuleParser.register_function(lambda amount: f"ordered {amount}", "order")
+    parser = RuleParser(lazy=True, optimize=True)
+    parser.parsestr(RULES)
+    return parser
+
+
+def test_lazy_load_defers_preparation(parser):
+    assert not any(rule.prepared for rule in parser.rules.values())
+    assert parser.optimization_report.rules == {}
+
+
+def test_rules_are_prepared_on_first_evaluation(parser):
+    parser.rules["broken"].enabled = False
+    result = parser.execute({"stock": 3})
+    assert result.results[0].rule_name == "very low"
+    assert parser.rules["very low"].prepared
+    assert not parser.rules["low"].prepared
+    assert parser.optimization_report.rules["very low"].simplified_booleans == 1
+
+
+def test_invalid_rule_raises_when_evaluated(parser):
+    with pytest.raises(SyntaxError):
+        parser.execute({"stock": 30})
+    assert not parser.rules["broken"].prepared
+
+
+def test_validate_all_reports_errors(parser):
+    errors = parser.validate_all()
+    assert list(errors) == ["broken"]
+    assert isinstance(errors["broken"], SyntaxError)
+    assert parser.rules["low"].prepared
+
+
+def test_validate_all_without_lazy():
+    parser = RuleParser()
+    parser.parsestr(RULES)
+    assert list(parser.validate_all()) == ["broken"]
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_warm_up_prepares_highest_priority_first(parser, background):
+    thread = parser.warm_up(2, background=background)
+    if background:
+        thread.join()
+    else:
+        assert thread is None
+    assert parser.rules["very low"].prepared
+    assert not parser.rules["broken"].prepared
+    assert not parser.rules["low"].prepared
+
+
+def test_freeze_prepares_all_rules(parser):
+    with pytest.raises(SyntaxError):
+        parser.freeze()
+    parser.remove_rule("broken")
+    frozen = parser.freeze()
+    assert frozen.execute({"stock": 3}).results[0].rule_name == "very low"
@@ -0,0 +1,99 @@
+import pytest
+
+from business_rule_engine import MissingArgumentError, RuleParser
+
+RULES = """
+rule "cheap" priority 1
+when
+    price < 10
+then
+    record("cheap")
+end
+
+rule "expensive"
+when
+    price > 100
+then
+    record("expensive")
+end
+
+rule "premium" priority 5
+when
+    price > 50 and category == "premium"
+then
+    record("premium")
+end
+"""
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def parser(calls):
+    RuleParser.register_function(calls.append, "record")
+    parser = RuleParser()
+    parser.parsestr(RULES)
+    return parser
+
+
+def test_match_returns_bitset_without_running_actions(parser, calls):
+    assert parser.match({"price": 200, "category": "premium"}) == 0b110
+    assert parser.match({"price": 5, "category": "basic"}) == 0b001
+    assert parser.match({"price": 20, "category": "basic"}) == 0
+    assert calls == []
+
+
+def test_disabled_rules_never_match(parser):
+    parser.rules["expensive"].enabled = False
+    assert parser.match({"price": 200, "category": "premium"}) == 0b100
+
+
+def test_version_changes_with_rule_set(parser):
+    version = parser.version
+    parser.add_rule("free", "price == 0", "1")
+    assert parser.version == version + 1
+    parser.remove_rule("cheap")
+    assert parser.version == version + 2
+    assert parser.match({"price": 0, "category": "basic"}) == 0b100
+
+
+def test_match_batch(parser):
+    records = [{"price": p, "category": "premium"} for p in (5, 60, 200, 20)]
+    matrix = parser.match_batch(records)
+
+    assert len(matrix) == 4
+    assert matrix.rule_names == ("cheap", "expensive", "premium")
+    assert matrix.version == parser.version
+    assert [matrix.row(i) for i in range(4)] == [0b001, 0b100, 0b110, 0]
+    assert matrix[2, 1]
+    assert not matrix[0, 1]
+    assert matrix.matched(2) == ["expensive", "premium"]
+    assert bytes(matrix.data) == bytes([0b001, 0b100, 0b110, 0])
+    with pytest.raises(IndexError):
+        matrix.row(4)
+
+
+def test_match_batch_with_many_rules():
+    parser = RuleParser()
+    for i in range(20):
+        parser.add_rule(f"r{i}", f"x >= {i}", "1")
+    matrix = parser.match_batch([{"x": x} for x in range(20)])
+    assert len(matrix.data) == 20 * 3
+    assert matrix.row(19) == (1 << 20) - 1
+    assert matrix.row(0) == 1
+
+
+def test_match_missing_argument(parser):
+    with pytest.raises(MissingArgumentError):
+        parser.match({"price": 60})
+    assert parser.match({"price": 60}, set_default_arg=True) == 0
+
+
+def test_frozen_match(parser):
+    frozen = parser.freeze()
+    assert frozen.version == parser.version
+    assert frozen.match({"price": 200, "category": "premium"}) == 0b110
+    assert frozen.match_batch([{"price": 5, "category": ""}]).row(0) == 0b001
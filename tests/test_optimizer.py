@@ -0,0 +1,89 @@
+import pytest
+
+from business_rule_engine import RuleParser
+from business_rule_engine.optimizer import LiteralSet
+
+
+def test_constant_folding():
+    parser = RuleParser(optimize=True)
+    parser.add_rule("r", "x < 60 * 60 and 1 == 1", "x + 2 * 3")
+    optimization = parser.optimization_report.rules["r"]
+    assert optimization.folded_constants == 3
+    result = parser.execute({"x": 100})
+    assert result.results[0].action_result == [106]
+    assert not parser.execute({"x": 5000})
+
+
+def test_literal_set():
+    values = ", ".join(f'"v{i}"' for i in range(500))
+    parser = RuleParser(optimize=True)
+    parser.add_rule("r", f"x in [{values}] and y not in (1, 2)", "True")
+    assert parser.optimization_report.rules["r"].literal_sets == 2
+    assert parser.execute({"x": "v499", "y": 3})
+    assert not parser.execute({"x": "v500", "y": 3})
+    assert not parser.execute({"x": "v1", "y": 2})
+
+
+def test_literal_set_unhashable_operand():
+    literal = LiteralSet([1, 2], "[1, 2]")
+    assert [1] not in literal
+    assert 2.0 in literal
+    assert repr(literal) == "[1, 2]"
+
+
+@pytest.mark.parametrize(("condition", "simplified", "expected"), [
+    ("True and x > 1", 1, True),
+    ("x > 1 and True and x < 10", 1, True),
+    ("False or x > 1", 1, True),
+    ("x > 10 or True or x > 1", 1, True),
+    ("(x if True else 0) > 1", 1, True),
+    ("False and x > 1", 1, False),
+    # the left operand may itself be the (falsy) result, so these must stay as written
+    ("x > 1 and True", 0, True),
+    ("x > 1 or False", 0, True),
+])
+def test_boolean_simplification_preserves_result(condition, simplified, expected):
+    parser = RuleParser(optimize=True)
+    parser.add_rule("r", condition, "True")
+    assert parser.optimization_report.rules["r"].simplified_booleans == simplified
+    assert bool(parser.execute({"x": 5})) is expected
+
+
+def test_dead_rule(rules_dir):
+    parser = RuleParser(optimize=True)
+    parser.parsestr("""
+rule "dead"
+when
+    x > 1
+    and 2 < 1
+then
+    x
+end
+""")
+    parser.add_rule("alive", "x > 1", "x")
+    assert parser.optimization_report.dead_rules == ["dead"]
+    assert parser.execute({"x": 5}).results[-1].rule_name == "alive"
+
+
+def test_failing_constant_is_not_folded():
+    parser = RuleParser(optimize=True)
+    parser.add_rule("r", "x > 1 / 0", "x")
+    assert not parser.optimization_report.rules["r"].changed
+    with pytest.raises(ZeroDivisionError):
+        parser.execute({"x": 1})
+
+
+def test_report_follows_rule_removal():
+    parser = RuleParser(optimize=True)
+    parser.add_rule("a", "1 == 1", "1")
+    parser.add_rule("b", "1 == 2", "1")
+    parser.remove_rule("a")
+    assert list(parser.optimization_report.rules) == ["b"]
+    parser.clear_rules()
+    assert not parser.optimization_report.rules
+
+
+def test_optimizer_disabled_by_default():
+    parser = RuleParser()
+    parser.add_rule("r", "1 == 1", "1")
+    assert not parser.optimization_report.rules
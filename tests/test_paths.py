@@ -0,0 +1,163 @@
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+from business_rule_engine import MissingArgumentError, RuleParser
+from business_rule_engine.expressions import ExpressionCache
+from business_rule_engine.paths import PathName, access_path
+
+ORDER = {"order": {"customer": {"address": {"country": "AT"}, "name": "Ann"}, "total": 120}, "item": {"sku": "A1"}}
+
+
+def test_access_chains_are_compiled_into_names():
+    node = ExpressionCache().get('order.customer.address.country == "AT" and item["sku"] == "A1"')
+    left = node.value.values[0].left
+    assert isinstance(left.id, PathName)
+    assert str(left.id) == "order.customer.address.country"
+    path = access_path(left.id)
+    assert path.root == "order"
+    assert [step.key for step in path.steps] == ["customer", "address", "country"]
+    assert str(node.value.values[1].left.id) == "item['sku']"
+
+
+def test_nested_params():
+    parser = RuleParser()
+    parser.add_rule("austria", 'order.customer.address.country == "AT" and item["sku"] == "A1"', "order.customer.name")
+    assert parser.execute(ORDER).results[0].action_result == ["Ann"]
+
+
+def test_attribute_access_on_objects():
+    parser = RuleParser()
+    parser.add_rule("big", "order.total > 100", "order.customer.name")
+    order = SimpleNamespace(total=150, customer=SimpleNamespace(name="Bob"))
+    assert parser.execute({"order": order}).results[0].action_result == ["Bob"]
+
+
+def test_paths_are_resolved_once_per_call():
+    class Order(dict):
+        reads = 0
+
+        def __getitem__(self, key):
+            Order.reads += 1
+            return super().__getitem__(key)
+
+    parser = RuleParser()
+    for i in range(5):
+        parser.add_rule(f"r{i}", f'order["total"] > {100 + i}', "1")
+    parser.execute({"order": Order(total=50)}, stop_on_first_trigger=False)
+    assert Order.reads == 1
+
+
+def test_missing_intermediate_key():
+    parser = RuleParser()
+    parser.add_rule("austria", 'order.customer.address.country == "AT"', "1")
+    with pytest.raises(MissingArgumentError):
+        parser.execute({"order": {"customer": {}}})
+    with pytest.raises(MissingArgumentError):
+        parser.execute({})
+    result = parser.execute({"order": {"customer": {}}}, set_default_arg=True, default_arg="AT")
+    assert result.results[0].triggered
+
+
+def test_missing_subscript_key():
+    parser = RuleParser()
+    parser.add_rule("sku", 'item["sku"] == "A1"', "1")
+    with pytest.raises(MissingArgumentError):
+        parser.execute({"item": {}})
+    assert not parser.execute({"item": {}}, set_default_arg=True)
+
+
+@pytest.mark.parametrize("item", [None, 5])
+def test_subscript_on_non_subscriptable_value(item):
+    parser = RuleParser()
+    parser.add_rule("sku", 'item["sku"] == "A1"', "1")
+    with pytest.raises(MissingArgumentError):
+        parser.execute({"item": item})
+    assert parser.execute({"item": item}, set_default_arg=True, default_arg="A1")
+
+
+@pytest.mark.parametrize("set_default_arg", [False, True])
+def test_paths_on_registered_functions(set_default_arg):
+    class Limits:
+        total = 100
+
+    RuleParser.register_function(Limits, "limits")
+    try:
+        parser = RuleParser()
+        parser.add_rule("over limit", "order.total > limits.total", "1")
+        assert parser.execute(ORDER, set_default_arg=set_default_arg, default_arg=1000)
+        assert parser.freeze().execute(ORDER, set_default_arg=set_default_arg, default_arg=1000)
+        assert parser.match(ORDER, set_default_arg=set_default_arg, default_arg=1000) == 1
+    finally:
+        RuleParser.unregister_function("limits")
+
+
+def test_paths_are_resolved_again_after_actions():
+    def bump(state):
+        state["n"] += 1
+
+    RuleParser.register_function(bump)
+    try:
+        parser = RuleParser()
+        parser.add_rule("first", 'state["n"] == 0', "bump(state)", priority=2)
+        parser.add_rule("second", 'state["n"] == 1', "1", priority=1)
+        result = parser.execute({"state": {"n": 0}}, stop_on_first_trigger=False)
+        assert [r.triggered for r in result.results] == [True, True]
+    finally:
+        RuleParser.unregister_function("bump")
+
+
+def test_method_calls_and_comprehensions_are_not_compiled():
+    parser = RuleParser()
+    parser.add_rule("r", 'order.get("total", 0) > 100 and [i.qty for i in items] == [2]', "1")
+    assert parser.execute({"order": {"total": 120}, "items": [SimpleNamespace(qty=2)]})
+
+
+def test_explain_shows_path_values():
+    parser = RuleParser()
+    parser.add_rule("austria", 'order.customer.address.country == "AT"', "1")
+    trace = parser.execute(ORDER, explain=True).trace[0]
+    assert trace.params == {"order.customer.address.country": "AT"}
+
+
+def test_decision_tree_branches_on_paths():
+    parser = RuleParser()
+    for i in range(20):
+        parser.add_rule(f"r{i}", f"order.total < {(i + 1) * 10}", f"{i}")
+    tree = parser.build_decision_tree(max_leaf_size=1)
+    for total in (5, 95, 195, 500):
+        params = {"order": {"total": total}}
+        assert tree.execute(params).results[-1:] == parser.execute(params).results[-1:]
+
+
+def test_explain_does_not_resolve_paths_of_actions_that_did_not_run():
+    parser = RuleParser()
+    parser.add_rule("r", "x > 5", 'item["sku"]')
+    result = parser.execute({"x": 1, "item": None}, explain=True)
+    assert not result
+    assert result.trace[0].params == {"x": 1}
+
+
+def test_dotted_param_keys_do_not_shadow_paths():
+    parser = RuleParser()
+    parser.add_rule("r", "o.z == 1", "1")
+    assert not parser.execute({"o": {"z": 2}, "o.z": 1})
+    with pytest.raises(MissingArgumentError):
+        parser.execute({"order.total": 5, "o.z": 1})
+
+
+def test_paths_are_released_with_the_expressions():
+    parser = RuleParser()
+    parser.add_rule("r", "order.total > 100", "1")
+    parser.execute(ORDER)
+    assert parser.expressions._paths
+    parser.clear_rules()
+    assert not parser.expressions._paths
+
+
+def test_path_names_can_be_pickled():
+    node = ExpressionCache().get("order.total > 100")
+    name = pickle.loads(pickle.dumps(node.value.left.id))
+    assert name == node.value.left.id
+    assert access_path(name) == access_path(node.value.left.id)
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from business_rule_engine import ConditionReturnValueError, MissingArgumentError, RuleParser, ShardError
+
+RULE_COUNT = 60
+
+
+def double(x):
+    return x * 2
+
+
+@pytest.fixture
+def parser():
+    RuleParser.register_function(double)
+    parser = RuleParser()
+    rng = random.Random(7)
+    for i in range(RULE_COUNT):
+        parser.add_rule(f"r{i}", f"x > {rng.randint(0, 100)} and y != {i % 7}", f"double({i})", priority=rng.randint(0, 5))
+    return parser
+
+
+@pytest.mark.parametrize("partition", ["priority", "hash"])
+def test_sharded_matches_linear_scan(parser, partition):
+    with parser.shard(3, partition=partition) as sharded:
+        assert len(sharded) == RULE_COUNT
+        for x in (-1, 10, 50, 99, 200):
+            for y in (0, 3):
+                for stop in (True, False):
+                    params = {"x": x, "y": y}
+                    expected = parser.execute(params, stop_on_first_trigger=stop)
+                    assert sharded.execute(params, stop_on_first_trigger=stop).results == expected.results
+
+
+def test_only_winner_actions_run(tmp_path):
+    log = tmp_path / "log"
+
+    def record(name):
+        with log.open("a") as f:
+            f.write(f"{name}\n")
+        return name
+
+    RuleParser.register_function(record)
+    parser = RuleParser()
+    for i in range(8):
+        parser.add_rule(f"r{i}", "True", f'record("r{i}")', priority=-i)
+    with parser.shard(4) as sharded:
+        result = sharded.execute({})
+    assert [r.rule_name for r in result.results] == ["r0"]
+    assert result.results[0].action_result == ["r0"]
+    assert log.read_text() == "r0\n"
+
+
+def test_errors_are_raised_in_priority_order():
+    parser = RuleParser()
+    parser.add_rule("first", "x > 0", "1", priority=3)
+    parser.add_rule("broken", "x + 1", "1", priority=2)
+    parser.add_rule("missing", "y > 0", "1", priority=1)
+    with parser.shard(3, partition="priority") as sharded:
+        with pytest.raises(ConditionReturnValueError):
+            sharded.execute({"x": 0})
+        assert sharded.execute({"x": 1}).results[0].rule_name == "first"
+        parser.rules["broken"].enabled = False
+    with parser.shard(2) as sharded, pytest.raises(MissingArgumentError):
+        sharded.execute({"x": 0})
+
+
+def test_unpicklable_error_becomes_shard_error():
+    parser = RuleParser()
+    parser.add_rule("r", "unknown_function(x)", "1")
+    with parser.shard(1) as sharded, pytest.raises(ShardError, match="FunctionNotDefined"):
+        sharded.execute({"x": 1})
+
+
+def test_invalid_arguments(parser):
+    with pytest.raises(ValueError, match="shards"):
+        parser.shard(0)
+    with pytest.raises(ValueError, match="partition"):
+        parser.shard(2, partition="random")
@@ -0,0 +1,115 @@
+import gc
+import threading
+
+import pytest
+
+from business_rule_engine import FrozenRuleSet, RuleParser, RuleSetHolder
+
+RULES = """
+rule "low" priority 1
+when
+    stock < 20
+then
+    order(50)
+end
+
+rule "very low" priority 5
+when
+    stock < 5
+then
+    order(200)
+end
+"""
+
+
+@pytest.fixture
+def parser():
+    RuleParser.register_function(lambda amount: f"ordered {amount}", "order")
+    parser = RuleParser()
+    parser.parsestr(RULES)
+    return parser
+
+
+def test_freeze_executes_like_parser(parser):
+    frozen = parser.freeze()
+    assert isinstance(frozen, FrozenRuleSet)
+    for stock in (1, 10, 30):
+        expected = parser.execute({"stock": stock}, stop_on_first_trigger=False)
+        assert frozen.execute({"stock": stock}, stop_on_first_trigger=False).results == expected.results
+    assert len(frozen) == 2
+    assert "low" in frozen
+    assert [r.rulename for r in frozen] == ["low", "very low"]
+
+
+def test_snapshot_is_isolated_from_later_changes(parser):
+    frozen = parser.freeze()
+    parser.rules["very low"].enabled = False
+    parser.remove_rule("low")
+    parser.clear_rules()
+    RuleParser.register_function(lambda amount: "changed", "order")
+
+    result = frozen.execute({"stock": 1})
+    assert result.results[0].rule_name == "very low"
+    assert result.results[0].action_result == ["ordered 200"]
+
+
+def test_snapshot_cannot_be_modified(parser):
+    frozen = parser.freeze()
+    with pytest.raises(AttributeError):
+        frozen.rules["low"].priority = 10
+    with pytest.raises(AttributeError):
+        frozen.rules["low"].conditions.append("and False")
+    with pytest.raises(TypeError):
+        frozen.rules["other"] = frozen.rules["low"]
+    with pytest.raises(TypeError):
+        frozen.functions["order"] = print
+
+
+def test_concurrent_execution_with_swap(parser):
+    holder = RuleSetHolder(parser.freeze())
+    updated = RuleParser()
+    updated.add_rule("low", "stock < 20", "order(1)")
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(200):
+                result = holder.current.execute({"stock": 10})
+                assert result.results[-1].action_result in (["ordered 50"], ["ordered 1"])
+        except AssertionError as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    previous = holder.swap(updated.freeze())
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert "very low" in previous
+    assert holder.current.execute({"stock": 10}).results[0].action_result == ["ordered 1"]
+
+
+def test_freeze_with_gc_freeze(parser):
+    try:
+        frozen = parser.freeze(gc_freeze=True)
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+    assert frozen.execute({"stock": 1})
+
+
+def test_frozen_decision_tree(parser):
+    tree = parser.freeze().build_decision_tree()
+    assert tree.execute({"stock": 10}).results[-1].rule_name == "low"
+
+
+def test_executing_a_snapshot_does_not_write_to_its_rules(parser):
+    frozen = parser.freeze()
+    frozen.execute({"stock": 1}, stop_on_first_trigger=False)
+    frozen.execute({"stock": 1}, stop_on_first_trigger=False, explain=True)
+    frozen.match({"stock": 1})
+    assert all(rule.status is None for rule in frozen.rules.values())
+    parser.execute({"stock": 1}, stop_on_first_trigger=False, explain=True)
+    assert all(rule.status for rule in parser.rules.values())
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from business_rule_engine import RuleParser, WorkloadRecorder, read_workload, replay
+from business_rule_engine.workload import MAGIC, main
+
+
+@pytest.fixture
+def parser():
+    parser = RuleParser()
+    parser.add_rule("low stock", "stock < 20", "50 - stock")
+    return parser
+
+
+def test_capture_and_read(parser, tmp_path):
+    path = tmp_path / "workload.bin"
+    with WorkloadRecorder(path) as recorder:
+        parser.recorder = recorder
+        parser.execute({"stock": 5})
+        parser.execute({"stock": 50}, stop_on_first_trigger=False, set_default_arg=True, default_arg=0)
+    parser.execute({"stock": 1})  # closed recorder, not recorded
+
+    records = list(read_workload(path))
+    assert [params for params, _ in records] == [{"stock": 5}, {"stock": 50}]
+    assert records[1][1] == {"stop_on_first_trigger": False, "set_default_arg": True, "default_arg": 0, "budget": None,
+                              "stop_on_first_band": False}
+    assert path.read_bytes().startswith(MAGIC)
+
+
+def test_capture_appends(parser, tmp_path):
+    path = tmp_path / "workload.bin"
+    for stock in (1, 2):
+        with WorkloadRecorder(path) as recorder:
+            recorder.record({"stock": stock}, {})
+    assert [params for params, _ in read_workload(path)] == [{"stock": 1}, {"stock": 2}]
+
+
+def test_sampling(tmp_path):
+    path = tmp_path / "workload.bin"
+    with WorkloadRecorder(path, sample_rate=0.25, seed=1) as recorder:
+        for i in range(400):
+            recorder.record({"i": i}, {})
+    assert 50 < recorder.recorded < 150
+    assert len(list(read_workload(path))) == recorder.recorded
+
+
+def test_concurrent_recording_and_unpicklable_params(tmp_path):
+    path = tmp_path / "workload.bin"
+    with WorkloadRecorder(path) as recorder:
+        threads = [
+            threading.Thread(target=lambda: [recorder.record({"x": i}, {}) for i in range(100)]) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        recorder.record({"lock": threading.Lock()}, {})
+    assert recorder.recorded == 400
+    assert recorder.skipped == 1
+    assert len(list(read_workload(path))) == 400
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    path = tmp_path / "workload.bin"
+    with WorkloadRecorder(path) as recorder:
+        recorder.record({"x": 1}, {})
+        recorder.record({"x": 2}, {})
+    path.write_bytes(path.read_bytes()[:-3])
+    assert [params for params, _ in read_workload(path)] == [{"x": 1}]
+
+
+def test_not_a_capture_file(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"something else")
+    with pytest.raises(ValueError, match="capture file"):
+        list(read_workload(path))
+    with pytest.raises(ValueError, match="capture file"):
+        WorkloadRecorder(path)
+
+
+def test_replay_reports_stats_and_diffs(parser, tmp_path):
+    path = tmp_path / "workload.bin"
+    with WorkloadRecorder(path) as recorder:
+        for stock in (5, 15, 25, {}):
+            recorder.record({"stock": stock}, {})
+
+    candidate = RuleParser()
+    candidate.add_rule("low stock", "stock < 10", "50 - stock")
+    report = replay(path, parser, candidate.freeze())
+
+    assert report.baseline.records == 4
+    assert report.baseline.errors == 1
+    assert report.baseline.throughput > 0
+    assert 0 < report.baseline.percentile(50) <= report.baseline.percentile(99)
+    assert [d.record for d in report.diffs] == [1]
+    assert report.diffs[0].baseline == [("low stock", [35])]
+    assert report.diffs[0].candidate == []
+
+
+def test_replay_cli(rules_dir, tmp_path, capsys):
+    path = tmp_path / "workload.bin"
+    with WorkloadRecorder(path) as recorder:
+        recorder.record({"x": 5}, {"stop_on_first_trigger": False})
+
+    rules = str(rules_dir / "stop_on_trigger.rule")
+    assert main([str(path), rules, "--compare", rules]) == 0
+    out = capsys.readouterr().out
+    assert "baseline: 1 records" in out
+    assert "0 records with different results" in out
+    assert main([str(tmp_path / "missing.bin"), rules]) == 1
+
+
+def test_importing_replay_cli_does_not_run_it():
+    import business_rule_engine
+    import business_rule_engine.replay_cli  # noqa: F401
+
+    assert business_rule_engine.replay is replay